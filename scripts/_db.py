@@ -0,0 +1,95 @@
+"""
+Shared database access for one-shot helper scripts.
+
+Creates a single SQLAlchemy engine per process, pointed at the same database
+the application uses (DATABASE_URL if set, otherwise config.DATABASE_PATH).
+Usage:
+    from scripts._db import session
+
+    with session() as db:
+        ...
+"""
+
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Generator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src import config
+
+# Partial/functional indexes for the lookups helper scripts run most: null-hash
+# and admin probes only index the rare matching rows; board names and symbol
+# image paths are matched case-insensitively by prefix.
+BOARD_NAME_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_boards_name ON communication_boards(name COLLATE NOCASE)"
+)
+SYMBOL_IMAGE_PATH_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS ix_symbol_image_path ON symbols(image_path COLLATE NOCASE)"
+)
+INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_users_null_password ON users(id) WHERE password_hash IS NULL",
+    "CREATE INDEX IF NOT EXISTS idx_users_admin ON users(user_type) WHERE user_type = 'admin'",
+    BOARD_NAME_INDEX_DDL,
+    SYMBOL_IMAGE_PATH_INDEX_DDL,
+)
+
+# Map the database file instead of read()-ing it page by page, with a 64 MiB page cache
+MMAP_PRAGMAS = ("mmap_size=268435456", "cache_size=-65536")
+# Connection-scoped write settings only; journal_mode=WAL would persist in the file
+WRITE_PRAGMAS = ("synchronous=NORMAL", "temp_store=MEMORY")
+
+
+def database_url() -> str:
+    """Same resolution order as the application engine."""
+    return os.environ.get("DATABASE_URL", "").strip() or f"sqlite:///{config.DATABASE_PATH}"
+
+
+@lru_cache(maxsize=None)
+def engine() -> Engine:
+    """Process-wide engine; scripts are single-threaded, so one pooled connection suffices."""
+    url = database_url()
+    if url.startswith("sqlite"):
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_engine(url)
+
+
+@lru_cache(maxsize=None)
+def _session_factory() -> sessionmaker:
+    return sessionmaker(bind=engine(), autoflush=False, expire_on_commit=False)
+
+
+@contextmanager
+def session() -> Generator[Session, None, None]:
+    """Open a session on the shared engine; callers commit explicitly."""
+    db = _session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def use_sqlite_pragmas(target: Engine, *pragmas: str) -> None:
+    """Run ``PRAGMA <pragma>`` on every new connection of a SQLite engine; no-op elsewhere."""
+    if target.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    # Connections pooled before the listener existed would never see it;
+    # an in-memory database would be lost with its connection, so keep that one.
+    if target.url.database not in (None, "", ":memory:"):
+        target.dispose()
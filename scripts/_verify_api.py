@@ -0,0 +1,37 @@
+"""
+Shared API session for the verify_* smoke scripts.
+
+Reads the server and account from the environment and keeps one keep-alive
+connection for every call. Usage:
+    from scripts._verify_api import BASE_URL, SESSION, login
+
+    login()
+    SESSION.get(f"{BASE_URL}/...")
+"""
+
+import os
+import sys
+
+import requests
+
+BASE_URL = os.environ.get("AAC_BASE_URL", "http://localhost:8086/api").rstrip("/")
+USERNAME = os.environ.get("AAC_VERIFY_USERNAME", "").strip()
+PASSWORD = os.environ.get("AAC_VERIFY_PASSWORD", "").strip()
+
+if not USERNAME or not PASSWORD:
+    raise SystemExit(
+        "Set AAC_VERIFY_USERNAME and AAC_VERIFY_PASSWORD before running this script."
+    )
+
+SESSION = requests.Session()
+
+
+def login():
+    """Log in and install the bearer header on SESSION."""
+    response = SESSION.post(
+        f"{BASE_URL}/auth/token", data={"username": USERNAME, "password": PASSWORD}
+    )
+    if response.status_code != 200:
+        print(f"Login failed: {response.text}")
+        sys.exit(1)
+    SESSION.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
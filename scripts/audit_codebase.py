@@ -1,18 +1,57 @@
 import ast
+import hashlib
 import os
+import pickle
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 # Configuration
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 SRC_DIR = PROJECT_ROOT / "src"
 EXCLUDES = {"__pycache__", ".git", ".pytest_cache", "node_modules", "dist", "frontend"}
+CACHE_FILE = PROJECT_ROOT / ".cache" / "audit_symbols.pkl"
+CACHE_VERSION = 2
+PY_VERSION = sys.version_info[:2]
+
+
+class ImportRecord(NamedTuple):
+    lineno: int
+    module: str
+    names: Tuple[str, ...]
+
+
+class FileScan(NamedTuple):
+    path: Path
+    symbols: FrozenSet[str]
+    imports: Tuple[ImportRecord, ...]
+    error: Optional[str] = None
+
+
+# (cache_version, py_version, sha256) -> (defined symbols, internal imports), persisted between runs
+_scan_cache: Dict[tuple, Tuple[FrozenSet[str], Tuple[ImportRecord, ...]]] = {}
+
+# Statement-list fields; definitions and imports can only appear in these
+BODY_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
 
 class SymbolVisitor(ast.NodeVisitor):
+    """Collect defined symbols and internal imports in a single pass.
+
+    Only statement bodies are traversed, never expressions, so each module
+    visits a small fraction of the nodes `ast.walk` would.
+    """
+
     def __init__(self):
         self.defined_symbols = set()
-        self.imported_symbols = set()
+        self.imports: List[ImportRecord] = []
+
+    def generic_visit(self, node):
+        for field in BODY_FIELDS:
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                for child in children:
+                    self.visit(child)
 
     def visit_ClassDef(self, node):
         self.defined_symbols.add(node.name)
@@ -42,93 +81,157 @@ class SymbolVisitor(ast.NodeVisitor):
         for alias in node.names:
             name = alias.asname or alias.name
             self.defined_symbols.add(name)
+        # We only care about internal imports starting with 'src'
+        if node.module and node.module.startswith("src"):
+            self.imports.append(ImportRecord(node.lineno, node.module, tuple(a.name for a in node.names)))
 
-def get_module_symbols(file_path: Path) -> Set[str]:
-    """Parse a file and return all globally defined symbols (classes, functions, vars)."""
+def load_symbol_cache() -> None:
+    """Load the on-disk scan cache from a previous run, if any."""
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            _scan_cache.update(pickle.load(f))
+    except (OSError, EOFError, pickle.UnpicklingError):
+        # Missing, unreadable or truncated cache: start from scratch
+        pass
+
+def save_symbol_cache(live_keys: Set[tuple]) -> None:
+    """Persist the scan cache so unchanged files are not reparsed next run.
+
+    Only entries for files seen in this run are kept; deleted or edited files
+    would otherwise leave their old entries behind forever.
+    """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            tree = ast.parse(f.read(), filename=str(file_path))
-        visitor = SymbolVisitor()
-        visitor.visit(tree)
-        return visitor.defined_symbols
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        live = {key: value for key, value in _scan_cache.items() if key in live_keys}
+        with open(CACHE_FILE, "wb") as f:
+            pickle.dump(live, f)
     except Exception as e:
-        print(f"⚠️  Error parsing {file_path}: {e}")
-        return set()
-
-def resolve_import_path(module_path: str) -> Path:
-    """Convert dotted python path (src.foo.bar) to file path."""
-    # Handle 'src.' prefix
-    parts = module_path.split(".")
-    current = PROJECT_ROOT
-    for part in parts:
-        current = current / part
-    
-    # Try .py
-    if current.with_suffix(".py").exists():
-        return current.with_suffix(".py")
-    
-    # Try package (__init__.py)
-    if (current / "__init__.py").exists():
-        return current / "__init__.py"
-    
-    return None
+        print(f"⚠️  Could not write symbol cache: {e}")
+
+def read_source(file_path: Path) -> Tuple[bytes, bytes]:
+    """Return the raw source of a file together with its sha256 digest."""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return data, hashlib.sha256(data).digest()
+
+def parse_file(file_path: Path, data: bytes) -> FileScan:
+    """Parse one file and extract its defined symbols and internal imports.
+
+    Runs in worker processes, so it must stay a picklable top-level function.
+    """
+    try:
+        tree = ast.parse(data, filename=str(file_path))
+    except Exception as e:
+        return FileScan(file_path, frozenset(), (), str(e))
+    visitor = SymbolVisitor()
+    visitor.visit(tree)
+    return FileScan(file_path, frozenset(visitor.defined_symbols), tuple(visitor.imports))
+
+def get_module_symbols(tree: ast.AST) -> Set[str]:
+    """Return all globally defined symbols (classes, functions, vars) of an already parsed tree."""
+    visitor = SymbolVisitor()
+    visitor.visit(tree)
+    return visitor.defined_symbols
+
+def scan_files(files: List[Path], live_keys: Set[tuple]) -> List[FileScan]:
+    """Scan files, reusing cached results and parsing the rest in a process pool.
+
+    Adds the cache key of every scanned file to live_keys.
+    """
+    scans: Dict[Path, FileScan] = {}
+    pending: List[Tuple[Path, bytes, tuple]] = []
+    for file_path in files:
+        data, sha = read_source(file_path)
+        key = (CACHE_VERSION, PY_VERSION, sha)
+        live_keys.add(key)
+        cached = _scan_cache.get(key)
+        if cached is not None:
+            scans[file_path] = FileScan(file_path, *cached)
+        else:
+            pending.append((file_path, data, key))
+
+    if pending:
+        paths, datas, keys = zip(*pending)
+        with ProcessPoolExecutor() as ex:
+            results = list(ex.map(parse_file, paths, datas, chunksize=16))
+        for key, scan in zip(keys, results):
+            if scan.error is None:
+                _scan_cache[key] = (scan.symbols, scan.imports)
+            scans[scan.path] = scan
+
+    return [scans[file_path] for file_path in files]
+
+def iter_py_files(root: Path) -> Iterator[Path]:
+    """Yield *.py files under root, pruning excluded directories before they are listed."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDES]
+        for name in filenames:
+            if name.endswith(".py"):
+                yield Path(dirpath) / name
+
+def module_name(file_path: Path) -> str:
+    """Convert a file path under PROJECT_ROOT to its dotted python path (src.foo.bar)."""
+    parts = file_path.relative_to(PROJECT_ROOT).with_suffix("").parts
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+def build_symbol_index(scans: List[FileScan]) -> Dict[str, Tuple[Path, FrozenSet[str]]]:
+    """Map every scanned module to its file and defined symbols."""
+    index: Dict[str, Tuple[Path, FrozenSet[str]]] = {}
+    for scan in scans:
+        if scan.error is not None:
+            continue
+        entry = (scan.path, scan.symbols)
+        name = module_name(scan.path)
+        if scan.path.name == "__init__.py":
+            # A sibling foo.py takes precedence over foo/__init__.py
+            index.setdefault(name, entry)
+        else:
+            index[name] = entry
+    return index
 
 def audit_codebase():
     print(f"Starting Deep Codebase Audit...")
     print(f"Root: {PROJECT_ROOT}")
     
     errors = []
-    
-    for file_path in SRC_DIR.rglob("*.py"):
-        rel_path = file_path.relative_to(PROJECT_ROOT)
-        
-        # Skip excluded dirs
-        if any(part in EXCLUDES for part in rel_path.parts):
-            continue
+    load_symbol_cache()
+
+    files = list(iter_py_files(SRC_DIR))
+    live_keys: Set[tuple] = set()
+    scans = scan_files(files, live_keys)
+    index = build_symbol_index(scans)
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                tree = ast.parse(f.read(), filename=str(file_path))
-        except Exception as e:
-            errors.append(f"Syntax Error in {rel_path}: {e}")
+    for scan in scans:
+        rel_path = scan.path.relative_to(PROJECT_ROOT)
+        if scan.error is not None:
+            errors.append(f"Syntax Error in {rel_path}: {scan.error}")
             continue
 
         # Check imports
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom):
-                module = node.module
-                if not module:
-                    continue
-                
-                # We only care about internal imports starting with 'src'
-                if not module.startswith("src"):
-                    continue
-
-                # 1. Verify Module Exists
-                target_file = resolve_import_path(module)
-                if not target_file:
-                    errors.append(f"{rel_path}:{node.lineno} - Module not found: '{module}'")
-                    continue
-
-                # 2. Verify Symbols Exist in Module
-                target_symbols = get_module_symbols(target_file)
-                
-                for alias in node.names:
-                    symbol = alias.name
-                    if symbol == "*":
-                        continue # Can't statically verify * imports easily
-                    
-                    if symbol not in target_symbols:
-                        # Check if it's imported in the target file (re-export)
-                        # This is a limitation of this simple script, but good enough for now
-                        # To be safe, we mainly look for definitions. 
-                        # If a file imports X and re-exports it, checking definitions fails.
-                        # Relaxing rule: warn only? Or try to be smarter?
-                        # For database.py, we define everything.
-                        
-                        # Special Case: sqlalchemy relationships or dymanic things
-                        # Let's flag it, verification will confirm.
-                         errors.append(f"{rel_path}:{node.lineno} - Symbol '{symbol}' not found in '{module}' (Target: {target_file.name})")
+        for imp in scan.imports:
+            # 1. Verify Module Exists
+            entry = index.get(imp.module)
+            if entry is None:
+                errors.append(f"{rel_path}:{imp.lineno} - Module not found: '{imp.module}'")
+                continue
+
+            # 2. Verify Symbols Exist in Module
+            target_file, target_symbols = entry
+
+            # Can't statically verify * imports easily
+            wanted = set(imp.names)
+            wanted.discard("*")
+
+            # Re-exports are only seen if the target file imports the name itself;
+            # this is a limitation of this simple script, but good enough for now.
+            # Special Case: sqlalchemy relationships or dymanic things
+            # Let's flag it, verification will confirm.
+            for symbol in sorted(wanted - target_symbols):
+                errors.append(f"{rel_path}:{imp.lineno} - Symbol '{symbol}' not found in '{imp.module}' (Target: {target_file.name})")
+
+    save_symbol_cache(live_keys)
 
     if errors:
         print("\nAudit Found Issues:")
@@ -1,12 +1,61 @@
 import asyncio
+import functools
 import json
+import re
 import time
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any, Optional
 
 import requests
 import websockets
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        # DevTools only accepts text frames, so hand websockets a str rather than bytes
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Keep-alive connection for repeated /json target polling
+_DEFAULT_SESSION = requests.Session()
+
+# (host, port) -> (monotonic timestamp, /json items); collapses bursts of target lookups
+_TARGETS_TTL_S = 0.5
+_targets_cache: dict[tuple[str, int], tuple[float, list[dict[str, Any]]]] = {}
+
+
+# CDP error messages meaning a remote objectId belonged to a context that is gone
+_STALE_OBJECT_ERRORS = ("Could not find object with given id", "Cannot find context with specified id")
+
+# CDP error messages meaning a navigation tore down the context an evaluation ran in
+_CONTEXT_LOST_ERRORS = ("Execution context was destroyed", "Cannot find context with specified id")
+
+# Events kept per method. Nothing reads most methods (Network.dataReceived,
+# Runtime.consoleAPICalled, ...), so each queue drops its oldest entry once full
+# instead of holding every payload of a long run.
+_EVENT_QUEUE_MAX = 256
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_url_re(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern)
+
+
+def _list_targets(host: str, port: int, session: requests.Session) -> list[dict[str, Any]]:
+    now = time.monotonic()
+    cached = _targets_cache.get((host, port))
+    if cached and now - cached[0] < _TARGETS_TTL_S:
+        return cached[1]
+    items = _loads(session.get(f"http://{host}:{port}/json", timeout=5).content)
+    _targets_cache[(host, port)] = (now, items)
+    return items
+
 
 @dataclass(frozen=True)
 class CDPTarget:
@@ -23,16 +72,15 @@ def get_page_target(
     host: str = "127.0.0.1",
     port: int = 9222,
     url_regex: str | None = r"^https?://(localhost|127\\.0\\.0\\.1):8086",
+    session: requests.Session | None = None,
 ) -> CDPTarget:
-    items = requests.get(f"http://{host}:{port}/json", timeout=5).json()
+    items = _list_targets(host, port, session or _DEFAULT_SESSION)
     pages = [it for it in items if it.get("type") == "page" and it.get("webSocketDebuggerUrl")]
     if not pages:
         raise RuntimeError(f"No page targets found at http://{host}:{port}/json")
 
     if url_regex:
-        import re
-
-        pat = re.compile(url_regex)
+        pat = _compile_url_re(url_regex)
         match = next((p for p in pages if pat.search(p.get("url", ""))), None)
         if match:
             return CDPTarget(url=match.get("url", ""), ws_url=match["webSocketDebuggerUrl"])
@@ -41,12 +89,40 @@ def get_page_target(
     return CDPTarget(url=page.get("url", ""), ws_url=page["webSocketDebuggerUrl"])
 
 
+def get_browser_ws_url(
+    host: str = "127.0.0.1",
+    port: int = 9222,
+    session: requests.Session | None = None,
+) -> str:
+    """Browser-level DevTools endpoint (needed for Target.* commands)."""
+    info = _loads((session or _DEFAULT_SESSION).get(f"http://{host}:{port}/json/version", timeout=5).content)
+    return info["webSocketDebuggerUrl"]
+
+
+_INFLIGHT_EVENTS = frozenset(
+    {"Network.requestWillBeSent", "Network.loadingFinished", "Network.loadingFailed"}
+)
+_CONTEXT_GONE_EVENTS = frozenset(
+    {"Runtime.executionContextsCleared", "Runtime.executionContextDestroyed"}
+)
+
+
 class CDP:
     def __init__(self, ws_url: str):
         self.ws_url = ws_url
         self._id = 0
         self._pending: dict[int, asyncio.Future] = {}
-        self._events: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        # One queue per event method, so waiters only wake for the events they asked for
+        self._event_queues: defaultdict[str, asyncio.Queue[dict[str, Any]]] = defaultdict(
+            lambda: asyncio.Queue(maxsize=_EVENT_QUEUE_MAX)
+        )
+        # requestIds seen in Network.requestWillBeSent but not yet finished/failed
+        self._inflight: set[str] = set()
+        self._network_changed = asyncio.Event()
+        self._domains_enabled = False
+        # Remote handle to the page's globalThis for call_function; dropped whenever
+        # a navigation tears down execution contexts (requires Runtime.enable)
+        self._global_object_id: Optional[str] = None
 
     async def __aenter__(self):
         self.ws = await websockets.connect(self.ws_url, max_size=2**25)
@@ -59,59 +135,190 @@ class CDP:
 
     async def _recv_loop(self):
         async for msg in self.ws:
-            data = json.loads(msg)
+            data = _loads(msg)
             if "id" in data and data["id"] in self._pending:
                 fut = self._pending.pop(data["id"])
                 if not fut.done():
                     fut.set_result(data)
-            else:
-                await self._events.put(data)
+            elif "method" in data:
+                method = data["method"]
+                if method in _INFLIGHT_EVENTS:
+                    request_id = (data.get("params") or {}).get("requestId")
+                    if method == "Network.requestWillBeSent":
+                        self._inflight.add(request_id)
+                    else:
+                        self._inflight.discard(request_id)
+                    self._network_changed.set()
+                elif method in _CONTEXT_GONE_EVENTS:
+                    self._global_object_id = None
+                queue = self._event_queues[method]
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(data)
 
     async def wait_for_event(self, method: str, timeout_s: float = 10) -> dict[str, Any]:
-        end = time.time() + timeout_s
-        while True:
-            remaining = end - time.time()
-            if remaining <= 0:
-                raise TimeoutError(f"Timed out waiting for event: {method}")
-            try:
-                ev = await asyncio.wait_for(self._events.get(), timeout=remaining)
-            except asyncio.TimeoutError as e:
-                raise TimeoutError(f"Timed out waiting for event: {method}") from e
-            if ev.get("method") == method:
-                return ev
+        try:
+            return await asyncio.wait_for(self._event_queues[method].get(), timeout=timeout_s)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f"Timed out waiting for event: {method}") from e
 
     async def wait_for_request(self, url_substring: str, timeout_s: float = 10) -> dict[str, Any]:
-        end = time.time() + timeout_s
+        queue = self._event_queues["Network.requestWillBeSent"]
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout_s
         while True:
-            remaining = end - time.time()
+            remaining = end - loop.time()
             if remaining <= 0:
                 raise TimeoutError(f"Timed out waiting for request containing: {url_substring}")
             try:
-                ev = await asyncio.wait_for(self._events.get(), timeout=remaining)
+                ev = await asyncio.wait_for(queue.get(), timeout=remaining)
             except asyncio.TimeoutError as e:
                 raise TimeoutError(f"Timed out waiting for request containing: {url_substring}") from e
-            if ev.get("method") != "Network.requestWillBeSent":
-                continue
             req = (ev.get("params") or {}).get("request") or {}
             url = req.get("url", "")
             if url_substring in url:
                 return ev
 
+    async def wait_for_response(self, url_pattern: str, timeout_s: float = 10) -> dict[str, Any]:
+        """
+        Wait for a Network.responseReceived whose URL matches url_pattern (requires
+        Network.enable). Responses queued before the call count too, so call
+        discard_events("Network.responseReceived") before triggering the request.
+        """
+        regex = _compile_url_re(url_pattern)
+        queue = self._event_queues["Network.responseReceived"]
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout_s
+        while True:
+            remaining = end - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"Timed out waiting for response matching: {url_pattern}")
+            try:
+                ev = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError as e:
+                raise TimeoutError(f"Timed out waiting for response matching: {url_pattern}") from e
+            resp = (ev.get("params") or {}).get("response") or {}
+            if regex.search(resp.get("url", "")):
+                return ev
+
+    async def wait_for_download(self, timeout_s: float = 30) -> dict[str, Any]:
+        """
+        Wait for a Page.downloadProgress event reporting "completed" (requires
+        set_download_dir and Page.enable) and return its params, plus the
+        "suggestedFilename" Page.downloadWillBegin announced for that guid. Call
+        discard_events("Page.downloadWillBegin", "Page.downloadProgress") before
+        triggering the download.
+        """
+        queue = self._event_queues["Page.downloadProgress"]
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout_s
+        while True:
+            remaining = end - loop.time()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for download to complete")
+            try:
+                ev = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError as e:
+                raise TimeoutError("Timed out waiting for download to complete") from e
+            params = ev.get("params") or {}
+            if params.get("state") == "completed":
+                return {**params, "suggestedFilename": self._download_filename(params.get("guid"))}
+            if params.get("state") == "canceled":
+                raise RuntimeError(f"Download {params.get('guid')} was canceled")
+
+    def _download_filename(self, guid: Optional[str]) -> Optional[str]:
+        queue = self._event_queues["Page.downloadWillBegin"]
+        while not queue.empty():
+            params = queue.get_nowait().get("params") or {}
+            if params.get("guid") == guid:
+                return params.get("suggestedFilename")
+        return None
+
+    def discard_events(self, *methods: str) -> None:
+        """Forget queued events so the next wait only sees ones that arrive afterwards."""
+        self._drain(*methods)
+
+    def _drain(self, *methods: str) -> None:
+        for method in methods:
+            queue = self._event_queues[method]
+            while not queue.empty():
+                queue.get_nowait()
+
+    async def wait_for_path(
+        self,
+        pattern: str | re.Pattern[str],
+        timeout_s: float = 10,
+        *,
+        fallback_poll_s: float = 1.0,
+    ) -> tuple[bool, Any]:
+        """
+        Wait until location.pathname matches pattern; returns (matched, last_path).
+
+        The path is re-read only when a Page navigation event arrives (requires
+        Page.enable), with a slow poll as a safety net for missed events.
+        """
+        regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+        methods = ("Page.frameNavigated", "Page.navigatedWithinDocument")
+        # Navigations queued by earlier steps say nothing about the current page
+        self._drain(*methods)
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout_s
+        while True:
+            path = await self.eval("location.pathname", await_promise=False)
+            if isinstance(path, str) and regex.search(path):
+                return True, path
+            remaining = end - loop.time()
+            if remaining <= 0:
+                return False, path
+            getters = [asyncio.ensure_future(self._event_queues[m].get()) for m in methods]
+            _, pending = await asyncio.wait(
+                getters,
+                timeout=min(remaining, fallback_poll_s),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for getter in pending:
+                getter.cancel()
+            # One re-read covers a burst of navigation events
+            self._drain(*methods)
+
+    async def wait_idle(self, quiet_s: float = 0.25, timeout_s: float = 10) -> bool:
+        """
+        Resolve once no request has been in flight for quiet_s (requires Network.enable).
+        Returns False if the network never settles within timeout_s.
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout_s
+        while True:
+            remaining = end - loop.time()
+            if remaining <= 0:
+                return False
+            self._network_changed.clear()
+            wait_s = min(quiet_s, remaining) if not self._inflight else remaining
+            try:
+                await asyncio.wait_for(self._network_changed.wait(), timeout=wait_s)
+            except asyncio.TimeoutError:
+                if not self._inflight:
+                    return True
+
     async def call(self, method: str, params: Optional[dict[str, Any]] = None, timeout: float = 30) -> dict[str, Any]:
         self._id += 1
         mid = self._id
         fut: asyncio.Future = asyncio.get_running_loop().create_future()
         self._pending[mid] = fut
-        await self.ws.send(json.dumps({"id": mid, "method": method, "params": params or {}}))
+        await self.ws.send(_dumps({"id": mid, "method": method, "params": params or {}}))
         data = await asyncio.wait_for(fut, timeout=timeout)
         if "error" in data:
             raise RuntimeError(f"CDP error calling {method}: {data['error']}")
         return data.get("result", {})
 
     async def enable(self):
+        # Domains stay enabled for the life of the connection, across navigations
+        if self._domains_enabled:
+            return
         await self.call("Page.enable")
         await self.call("Runtime.enable")
         await self.call("Network.enable")
+        self._domains_enabled = True
 
     async def eval(self, expression: str, *, await_promise: bool = True, timeout: float = 30) -> Any:
         res = await self.call(
@@ -130,21 +337,132 @@ class CDP:
             raise RuntimeError(f"Runtime.evaluate exception: {text} {exc}".strip())
         return (res.get("result") or {}).get("value")
 
-    async def goto(self, url: str):
-        await self.call("Page.navigate", {"url": url})
+    async def eval_handle(self, expression: str) -> Optional[str]:
+        """Evaluate expression and return a remote objectId for its result, or None for null/primitives."""
+        res = await self.call("Runtime.evaluate", {"expression": expression, "returnByValue": False})
+        if res.get("exceptionDetails"):
+            details = res["exceptionDetails"]
+            raise RuntimeError(f"Runtime.evaluate exception: {details.get('text', 'Uncaught')}")
+        return (res.get("result") or {}).get("objectId")
+
+    async def query_selector(self, selector: str) -> Optional[str]:
+        """Return a remote objectId for document.querySelector(selector), or None if absent."""
+        return await self.eval_handle(f"document.querySelector({json.dumps(selector)})")
 
-    async def wait_for_js(self, js_predicate: str, timeout_s: float = 15) -> bool:
-        start = time.time()
-        while time.time() - start < timeout_s:
+    async def call_on(
+        self, object_id: str, function_declaration: str, *args: Any, return_by_value: bool = True
+    ) -> Any:
+        """
+        Call a function with `this` bound to a remote object from query_selector/eval_handle.
+        args travel as CallArguments, so values never need splicing into the source.
+        With return_by_value=False the result comes back as a remote objectId (or None).
+        """
+        res = await self.call(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": function_declaration,
+                "arguments": [{"value": arg} for arg in args],
+                "returnByValue": return_by_value,
+            },
+        )
+        if res.get("exceptionDetails"):
+            details = res["exceptionDetails"]
+            raise RuntimeError(f"Runtime.callFunctionOn exception: {details.get('text', 'Uncaught')}")
+        return (res.get("result") or {}).get("value" if return_by_value else "objectId")
+
+    async def call_function(self, function_declaration: str, *args: Any, return_by_value: bool = True) -> Any:
+        """Call a function on the page's global object with JSON-serializable args."""
+        for attempt in range(2):
+            if self._global_object_id is None:
+                res = await self.call("Runtime.evaluate", {"expression": "globalThis", "returnByValue": False})
+                self._global_object_id = (res.get("result") or {}).get("objectId")
+            try:
+                return await self.call_on(
+                    self._global_object_id, function_declaration, *args, return_by_value=return_by_value
+                )
+            except RuntimeError as e:
+                # A navigation can outrun its executionContextsCleared event; refetch once
+                if attempt or not any(msg in str(e) for msg in _STALE_OBJECT_ERRORS):
+                    raise
+                self._global_object_id = None
+
+    async def add_init_script(self, source: str) -> None:
+        """Run source in the current document and in every document this page loads after it."""
+        await self.call("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        await self.eval(source, await_promise=False)
+
+    async def goto(self, url: str, *, wait_for_load: bool = False, timeout_s: float = 30):
+        """
+        Navigate; with wait_for_load, also wait for Page.frameStoppedLoading so
+        follow-up evals run against the new document instead of the outgoing one.
+        """
+        if wait_for_load:
+            self._drain("Page.frameStoppedLoading")
+        await self.call("Page.navigate", {"url": url})
+        if wait_for_load:
+            await self.wait_for_event("Page.frameStoppedLoading", timeout_s=timeout_s)
+
+    async def wait_for_js(
+        self,
+        js_predicate: str,
+        timeout_s: float = 15,
+        *,
+        poll_interval: float = 0.05,
+        max_poll_interval: float = 0.2,
+    ) -> bool:
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout_s
+        delay = poll_interval
+        while loop.time() < end:
             ok = await self.eval(js_predicate, await_promise=False)
             if ok:
                 return True
-            await asyncio.sleep(0.2)
+            await asyncio.sleep(min(delay, max(0.0, end - loop.time())))
+            delay = min(delay * 2, max_poll_interval)
         return False
 
+    async def wait_js_promise(self, predicate_js: str, timeout_s: float = 15) -> bool:
+        """
+        Resolve as soon as a MutationObserver in the page sees predicate_js turn truthy.
+        Only for DOM conditions: a predicate that changes without a DOM mutation
+        (navigator.onLine, speechSynthesis, ...) is checked once, then at timeout.
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + timeout_s
+        while True:
+            remaining = end - loop.time()
+            if remaining <= 0:
+                return False
+            js = f"""new Promise((resolve) => {{
+  const check = () => {{ try {{ return Boolean({predicate_js}); }} catch (e) {{ return false; }} }};
+  if (check()) return resolve(true);
+  const obs = new MutationObserver(() => {{
+    if (check()) {{ obs.disconnect(); resolve(true); }}
+  }});
+  obs.observe(document, {{ childList: true, subtree: true, attributes: true, characterData: true }});
+  setTimeout(() => {{ obs.disconnect(); resolve(check()); }}, {int(remaining * 1000)});
+}})"""
+            try:
+                return bool(await self.eval(js, await_promise=True, timeout=remaining + 5))
+            except RuntimeError as e:
+                # Only a navigation that destroyed the context mid-wait is worth retrying
+                # on the new document; a bad predicate or a closed target is not
+                if not any(msg in str(e) for msg in _CONTEXT_LOST_ERRORS):
+                    raise
+                await asyncio.sleep(0.05)
+
     async def wait_for_selector(self, selector: str, timeout_s: float = 15) -> bool:
-        sel = json.dumps(selector)
-        return await self.wait_for_js(f"Boolean(document.querySelector({sel}))", timeout_s=timeout_s)
+        """Resolve as soon as a MutationObserver in the page sees the selector match."""
+        return await self.wait_js_promise(f"document.querySelector({json.dumps(selector)})", timeout_s)
+
+    async def wait_for_text(self, pattern: str, timeout_s: float = 15, *, ignore_case: bool = True) -> bool:
+        """Resolve as soon as a MutationObserver sees document.body.innerText match pattern."""
+        rx = json.dumps(pattern)
+        flags = json.dumps("i" if ignore_case else "")
+        return await self.wait_js_promise(
+            f"document.body && new RegExp({rx}, {flags}).test(document.body.innerText)", timeout_s
+        )
 
     async def click(self, selector: str):
         sel = json.dumps(selector)
@@ -280,3 +598,38 @@ class CDP:
             "Page.setDownloadBehavior",
             {"behavior": "allow", "downloadPath": download_dir},
         )
+
+
+class IsolatedContext:
+    """
+    A fresh browser context (separate cookies/storage, like an incognito window)
+    on an already running Chrome. Pages opened here do not share login state with
+    other contexts, so independent flows can run side by side.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9222):
+        self.host = host
+        self.port = port
+        self._browser: CDP | None = None
+        self._context_id: str | None = None
+
+    async def __aenter__(self):
+        self._browser = CDP(get_browser_ws_url(self.host, self.port))
+        await self._browser.__aenter__()
+        res = await self._browser.call("Target.createBrowserContext")
+        self._context_id = res["browserContextId"]
+        return self
+
+    async def __aexit__(self, *exc):
+        try:
+            await self._browser.call("Target.disposeBrowserContext", {"browserContextId": self._context_id})
+        finally:
+            await self._browser.__aexit__(*exc)
+
+    async def new_page(self, url: str = "about:blank") -> CDPTarget:
+        res = await self._browser.call(
+            "Target.createTarget",
+            {"url": url, "browserContextId": self._context_id},
+        )
+        ws_url = f"ws://{self.host}:{self.port}/devtools/page/{res['targetId']}"
+        return CDPTarget(url=url, ws_url=ws_url)
@@ -1,22 +1,19 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import sys
+from pathlib import Path
 
-from src.aac_app.models.database import CommunicationBoard
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
-# Database setup
-DATABASE_URL = "sqlite:///./aac_app.db"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from scripts._db import session  # noqa: E402
+from src.aac_app.models.database import CommunicationBoard  # noqa: E402
 
 
 def list_boards():
-    db = SessionLocal()
-    try:
+    with session() as db:
         boards = db.query(CommunicationBoard).all()
         for board in boards:
             print(f"ID: {board.id}, Name: {board.name}")
-    finally:
-        db.close()
 
 
 if __name__ == "__main__":
@@ -1,24 +1,34 @@
 import os
-import sqlite3
+import sys
+from pathlib import Path
 
-db_path = os.path.join("data", "aac_assistant.db")
-print(f"Checking DB at: {db_path}")
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
-if not os.path.exists(db_path):
+from scripts._db import database_url, engine  # noqa: E402
+
+url = database_url()
+print(f"Checking DB at: {url}")
+
+db_path = url.removeprefix("sqlite:///")
+if url.startswith("sqlite:///") and not os.path.exists(db_path):
     print("DB file does not exist!")
     exit(1)
 
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
-
-# List boards
-try:
-    cursor.execute("SELECT id, name FROM communication_boards")
-    boards = cursor.fetchall()
-    print("Boards:")
-    for board in boards:
-        print(f"ID: {board[0]}, Name: {board[1]}")
-except Exception as e:
-    print("Error querying boards:", e)
+with engine().connect() as conn:
+    if url.startswith("sqlite"):
+        # Read-only listing: never take a write lock
+        conn.exec_driver_sql("PRAGMA query_only=1")
 
-conn.close()
+    # List boards
+    try:
+        boards = conn.exec_driver_sql("SELECT id, name FROM communication_boards").fetchall()
+        print("Boards:")
+        for board in boards:
+            print(f"ID: {board[0]}, Name: {board[1]}")
+    except Exception as e:
+        print("Error querying boards:", e)
+    finally:
+        if url.startswith("sqlite"):
+            conn.exec_driver_sql("PRAGMA query_only=0")
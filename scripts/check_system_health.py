@@ -53,11 +53,11 @@ def check_critical_users():
 
     with get_session() as session:
         users = ["student1", "teacher1", "admin1"]
-        missing = []
-        for u in users:
-            user = session.query(User).filter(User.username == u).first()
-            if not user:
-                missing.append(u)
+        found = {
+            row[0]
+            for row in session.query(User.username).filter(User.username.in_(users)).all()
+        }
+        missing = [u for u in users if u not in found]
 
         if missing:
             raise Exception(f"Missing critical users: {', '.join(missing)}")
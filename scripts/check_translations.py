@@ -1,27 +1,54 @@
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    _loads = json.loads
+
 
 def load_json(path):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _loads(Path(path).read_bytes())
     except Exception as e:
         print(f"Error loading {path}: {e}")
         return {}
 
 
-def compare_keys(base_data, target_data, path=""):
-    missing = []
-    if isinstance(base_data, dict):
-        for key, value in base_data.items():
-            current_path = f"{path}.{key}" if path else key
-            if key not in target_data:
-                missing.append(current_path)
-            else:
-                missing.extend(compare_keys(value, target_data[key], current_path))
-    return missing
+def flatten(data):
+    """Return every key path in a nested dict as a set of tuples, walking with an explicit stack."""
+    keys = set()
+    stack = [(data, ())]
+    while stack:
+        node, prefix = stack.pop()
+        for key, value in node.items():
+            path = prefix + (key,)
+            keys.add(path)
+            if isinstance(value, dict):
+                stack.append((value, path))
+    return keys
+
+
+@lru_cache(maxsize=None)
+def _flatten_cached(path, mtime_ns):
+    data = load_json(path)
+    return frozenset(flatten(data)) if isinstance(data, dict) else frozenset()
+
+
+def flatten_file(path):
+    """Flattened key set of a JSON file, reused while the file is unchanged."""
+    path = Path(path)
+    return _flatten_cached(path, path.stat().st_mtime_ns)
+
+
+def missing_keys(base_keys, target_keys):
+    """Dotted paths in base_keys but not target_keys, reporting only the top-most missing key."""
+    missing = base_keys - target_keys
+    return [".".join(k) for k in sorted(missing) if k[:-1] not in missing]
 
 
 def main():
@@ -47,13 +74,10 @@ def main():
                 print(f"MISSING FILE: {rel_path / file}")
                 continue
 
-            en_data = load_json(en_file_path)
-            es_data = load_json(es_file_path)
-
-            missing_keys = compare_keys(en_data, es_data)
-            if missing_keys:
+            missing = missing_keys(flatten_file(en_file_path), flatten_file(es_file_path))
+            if missing:
                 print(f"\nFile: {rel_path / file}")
-                for key in missing_keys:
+                for key in missing:
                     print(f"  - {key}")
 
 
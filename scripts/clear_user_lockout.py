@@ -2,13 +2,25 @@ import os
 import sqlite3
 import sys
 
-def clear_lockout(username):
+# Stay under SQLite's default bound-parameter limit
+MAX_PARAMS = 500
+
+
+def clear_lockouts(usernames):
+    usernames = list(dict.fromkeys(usernames))
+    if not usernames:
+        return
+
     db_path = os.path.join("data", "aac_assistant.db")
     if not os.path.exists(db_path):
         print(f"DB not found at {db_path}")
         return
 
     conn = sqlite3.connect(db_path)
+    # Connection-scoped only; journal_mode is left alone because WAL would persist
+    # in the application's database file after this one-off script exits
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     cursor = conn.cursor()
     
     # In this system, lockout logic is likely tracked via the failed_login_attempts table (audit logs) 
@@ -18,19 +30,33 @@ def clear_lockout(username):
     # But simpler is to just delete recent failed attempts for this user
     
     try:
-        cursor.execute("DELETE FROM failed_login_attempts WHERE username = ?", (username,))
-        if cursor.rowcount == 0:
-             print(f"No failed attempts found for {username} to clear.")
+        cleared = 0
+        with conn:
+            for i in range(0, len(usernames), MAX_PARAMS):
+                batch = usernames[i : i + MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(
+                    f"DELETE FROM failed_login_attempts WHERE username IN ({placeholders})",
+                    batch,
+                )
+                cleared += cursor.rowcount
+        who = ", ".join(usernames)
+        if cleared == 0:
+             print(f"No failed attempts found for {who} to clear.")
         else:
-             print(f"Cleared {cursor.rowcount} failed attempts for {username}.")
-             conn.commit()
+             print(f"Cleared {cleared} failed attempts for {who}.")
     except Exception as e:
         print(f"Error clearing attempts: {e}")
     
     conn.close()
 
+
+def clear_lockout(username):
+    clear_lockouts([username])
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python clear_user_lockout.py <username>")
+    if len(sys.argv) < 2:
+        print("Usage: python clear_user_lockout.py <username> [<username> ...]")
     else:
-        clear_lockout(sys.argv[1])
+        clear_lockouts(sys.argv[1:])
@@ -1,12 +1,16 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import sys
+from pathlib import Path
 
-from src.aac_app.models.database import BoardSymbol, CommunicationBoard, Symbol
-from src.config import DATABASE_PATH
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
-engine = create_engine(f"sqlite:///{DATABASE_PATH}")
-Session = sessionmaker(bind=engine)
-session = Session()
+from sqlalchemy.orm import Session  # noqa: E402
+
+from scripts._db import engine  # noqa: E402
+from src.aac_app.models.database import BoardSymbol, CommunicationBoard, Symbol  # noqa: E402
+
+session = Session(bind=engine())
 
 # Find the horse symbol on Student Flow Board (ID 8)
 board_id = 8
@@ -4,28 +4,64 @@ AAC Assistant 2.0 - Model Download Script
 Downloads all required models for offline use
 """
 
-import platform
+import functools
+import importlib.util
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from loguru import logger
 
+try:
+    import orjson
 
-def check_ollama_installed():
-    """Check if Ollama is installed"""
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    def _dumps_pretty(obj) -> bytes:
+        return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# pip package names whose importable module differs from the name with "-" -> "_"
+PACKAGE_TO_MODULE = {
+    "openai-whisper": "whisper",
+    "faiss-cpu": "faiss",
+    "pyyaml": "yaml",
+    "pillow": "PIL",
+}
+
+# Same host as src/aac_app/services/arasaac.py
+ARASAAC_IMAGE_BASE = "https://static.arasaac.org/pictograms"
+
+
+def package_installed(package: str) -> bool:
+    """Check for a package without executing its module code."""
+    module_name = PACKAGE_TO_MODULE.get(package, package.replace("-", "_"))
     try:
-        result = subprocess.run(["ollama", "--version"], capture_output=True, text=True)
-        if result.returncode == 0:
-            logger.info(f"Ollama found: {result.stdout.strip()}")
-            return True
-    except FileNotFoundError:
-        pass
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def check_ollama_installed():
+    """Check if Ollama is installed (PATH lookup only, no subprocess)"""
+    ollama_path = shutil.which("ollama")
+    if ollama_path:
+        logger.info(f"Ollama found: {ollama_path}")
+        return True
     return False
 
 
 def install_ollama():
     """Install Ollama based on platform"""
+    import platform
+
     system = platform.system().lower()
 
     logger.info(f"Installing Ollama for {system}")
@@ -37,40 +73,30 @@ def install_ollama():
         logger.info("3. Return here to continue")
         input("Press Enter when Ollama is installed...")
 
-    elif system == "darwin":  # macOS
+    else:  # macOS, Linux and others
         try:
-            # Download install script safely
-            result = subprocess.run(
+            # Pipe the install script straight into sh (safer than shell=True)
+            curl = subprocess.Popen(
                 ["curl", "-fsSL", "https://ollama.ai/install.sh"],
-                capture_output=True,
-                text=True,
-                check=True,
+                stdout=subprocess.PIPE,
             )
-            # Execute with sh (safer than shell=True)
-            subprocess.run(["sh", "-c", result.stdout], check=True)
-        except subprocess.CalledProcessError:
-            logger.error(
-                "Failed to install Ollama. Please install manually from https://ollama.ai"
-            )
-            return False
-
-    else:  # Linux and others
-        try:
-            # Download install script safely
-            result = subprocess.run(
-                ["curl", "-fsSL", "https://ollama.ai/install.sh"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            # Execute with sh (safer than shell=True)
-            subprocess.run(["sh", "-c", result.stdout], check=True)
-        except subprocess.CalledProcessError:
+            sh = subprocess.Popen(["sh"], stdin=curl.stdout)
+            # Let curl get SIGPIPE if sh exits early
+            curl.stdout.close()
+            sh_returncode = sh.wait()
+            curl_returncode = curl.wait()
+            if curl_returncode != 0 or sh_returncode != 0:
+                raise subprocess.CalledProcessError(
+                    curl_returncode or sh_returncode, "curl -fsSL https://ollama.ai/install.sh | sh"
+                )
+        except (subprocess.CalledProcessError, FileNotFoundError):
             logger.error(
                 "Failed to install Ollama. Please install manually from https://ollama.ai"
             )
             return False
 
+    # PATH changed under us; drop the cached negative result
+    check_ollama_installed.cache_clear()
     return check_ollama_installed()
 
 
@@ -139,15 +165,27 @@ def pull_ollama_model(model_name: str = "qwen:7b-q4_0"):
         logger.info(
             "This may take 10-30 minutes depending on your internet connection..."
         )
-        result = subprocess.run(
-            ["ollama", "pull", model_name], capture_output=True, text=True
+        # Stream progress instead of buffering the whole pull output in memory
+        proc = subprocess.Popen(
+            ["ollama", "pull", model_name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
         )
-
-        if result.returncode == 0:
+        last_line = ""
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line and line != last_line:
+                logger.info(line)
+                last_line = line
+        returncode = proc.wait()
+
+        if returncode == 0:
             logger.success(f"✅ Ollama model '{model_name}' pulled successfully!")
             return True
         else:
-            logger.error(f"❌ Failed to pull Ollama model: {result.stderr}")
+            logger.error(f"❌ Failed to pull Ollama model: {last_line}")
             return False
 
     except subprocess.TimeoutExpired:
@@ -161,7 +199,51 @@ def pull_ollama_model(model_name: str = "qwen:7b-q4_0"):
         return False
 
 
-def download_arasaac_symbols():
+@functools.lru_cache(maxsize=None)
+def _http_client():
+    """Process-wide keep-alive client so symbol fetches reuse connections (HTTP/2 when h2 is installed)."""
+    import httpx
+
+    http2 = importlib.util.find_spec("h2") is not None
+    return httpx.Client(
+        http2=http2,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+
+
+def _fetch_symbol_image(client, arasaac_id: int, symbols_dir: Path) -> bool:
+    target = symbols_dir / f"{arasaac_id}.png"
+    url = f"{ARASAAC_IMAGE_BASE}/{arasaac_id}/{arasaac_id}_500.png"
+    try:
+        # Stream straight to disk so memory stays flat regardless of image size
+        with client.stream("GET", url) as response:
+            response.raise_for_status()
+            with open(target, "wb") as f:
+                for chunk in response.iter_bytes():
+                    f.write(chunk)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to download ARASAAC symbol {arasaac_id}: {e}")
+        target.unlink(missing_ok=True)
+        return False
+
+
+def download_arasaac_images(arasaac_ids, symbols_dir: Path, max_workers: int = 8) -> int:
+    """Fetch pictograms over one shared client; returns how many were saved"""
+    arasaac_ids = list(arasaac_ids)
+    if not arasaac_ids:
+        return 0
+    client = _http_client()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(arasaac_ids))) as ex:
+        results = ex.map(
+            lambda arasaac_id: _fetch_symbol_image(client, arasaac_id, symbols_dir),
+            arasaac_ids,
+        )
+        return sum(results)
+
+
+def download_arasaac_symbols(arasaac_ids=()):
     """Download sample AAC symbols from ARASAAC"""
     logger.info("📥 Downloading sample AAC symbols...")
 
@@ -200,16 +282,17 @@ def download_arasaac_symbols():
         ]
 
         # Create symbol metadata file
-        import json
+        (symbols_dir / "symbols_metadata.json").write_bytes(_dumps_pretty(sample_symbols))
 
-        with open(symbols_dir / "symbols_metadata.json", "w") as f:
-            json.dump(sample_symbols, f, indent=2)
+        if arasaac_ids:
+            saved = download_arasaac_images(arasaac_ids, symbols_dir)
+            logger.info(f"Downloaded {saved}/{len(arasaac_ids)} ARASAAC pictograms")
 
         logger.success("✅ Sample symbols created successfully!")
         return True
 
     except ImportError:
-        logger.warning("⚠️  requests not available. Skipping symbol download.")
+        logger.warning("⚠️  httpx not available. Skipping symbol download.")
         return True  # Not critical for basic functionality
     except Exception as e:
         logger.error(f"❌ Failed to download symbols: {e}")
@@ -247,13 +330,21 @@ def check_dependencies():
 
     missing_packages = []
 
-    for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
-            logger.debug(f"✅ {package} is installed")
-        except ImportError:
-            missing_packages.append(package)
-            logger.warning(f"⚠️  {package} is not installed")
+    # Probe concurrently; find_spec only stats the finders, nothing is imported
+    with ThreadPoolExecutor(max_workers=min(8, len(required_packages))) as ex:
+        futures = {
+            ex.submit(package_installed, package): package
+            for package in required_packages
+        }
+        for future in as_completed(futures):
+            package = futures[future]
+            if future.result():
+                logger.debug(f"✅ {package} is installed")
+            else:
+                missing_packages.append(package)
+                logger.warning(f"⚠️  {package} is not installed")
+
+    missing_packages.sort(key=required_packages.index)
 
     if missing_packages:
         logger.error(f"❌ Missing packages: {', '.join(missing_packages)}")
@@ -294,13 +385,15 @@ def main():
     logger.info("Downloading AI models...")
     logger.info("=" * 50)
 
-    # Download Whisper model
-    if not download_whisper_model():
-        success = False
-
-    # Download Sentence Transformers model
-    if not download_sentence_transformers_model():
-        success = False
+    # Whisper and Sentence Transformers come from different hosts, so fetch
+    # them side by side; both results are collected even if one fails.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        downloads = [
+            ex.submit(download_whisper_model),
+            ex.submit(download_sentence_transformers_model),
+        ]
+        if not all([future.result() for future in downloads]):
+            success = False
 
     # Download Ollama model (this requires Ollama to be running)
     logger.info("\n" + "=" * 50)
@@ -21,8 +21,17 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy import text  # noqa: E402
+
+from scripts._db import INDEX_DDL  # noqa: E402
 from src import config  # noqa: E402
-from src.aac_app.models.database import User, get_session, init_database  # noqa: E402
+from src.aac_app.models.database import (  # noqa: E402
+    Base,
+    User,
+    create_engine_instance,
+    get_session,
+    init_database,
+)
 from src.aac_app.services.auth_service import get_password_hash  # noqa: E402
 
 
@@ -35,6 +44,25 @@ def _read_str(key: str, default: str) -> str:
     return value if value else default
 
 
+def _database_initialized() -> bool:
+    """
+    True when init_database() would be a no-op: every model table exists and
+    users already has a row. Answered with two cheap reads instead of DDL.
+    """
+    engine = create_engine_instance()
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect() as conn:
+        tables = set(
+            conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'table'")
+            ).scalars()
+        )
+        if not tables.issuperset(Base.metadata.tables):
+            return False
+        return conn.execute(text("SELECT 1 FROM users LIMIT 1")).first() is not None
+
+
 def ensure_bootstrap_admin() -> int:
     enabled = _read_bool("AAC_BOOTSTRAP_ADMIN_ON_FIRST_RUN", True)
     if not enabled:
@@ -44,10 +72,14 @@ def ensure_bootstrap_admin() -> int:
     username = _read_str("AAC_BOOTSTRAP_ADMIN_USERNAME", "admin1")
     password = _read_str("AAC_BOOTSTRAP_ADMIN_PASSWORD", "Admin123")
 
-    # Ensure DB/tables exist first.
-    init_database()
+    # Ensure DB/tables exist first (skipped on warm installs).
+    if not _database_initialized():
+        init_database()
 
     with get_session() as session:
+        for ddl in INDEX_DDL:
+            session.execute(text(ddl))
+
         existing_admin = session.query(User).filter(User.user_type == "admin").first()
         if existing_admin:
             print(f"Admin user already exists: {existing_admin.username}")
@@ -24,12 +24,16 @@ warnings.filterwarnings(
     category=DeprecationWarning,
 )
 
-import datetime
-import importlib
+import functools
+import importlib.util
+import os
+import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, TextIO
 
 # Core Python packages used by the local speech stack.
 # REQUIRED_PACKAGES must all succeed for full voice/microphone support.
@@ -59,107 +63,121 @@ def ensure_logs_dir() -> Path:
     return base
 
 
-def run_install(packages: List[str]) -> subprocess.CompletedProcess:
+def module_missing(pkg: str) -> bool:
+    """Return True if the module for this package cannot be found (without importing it)."""
+    module_name = PACKAGE_TO_MODULE.get(pkg, pkg.replace("-", "_"))
+    try:
+        return importlib.util.find_spec(module_name) is None
+    except (ImportError, ValueError):
+        return True
+
+
+def missing_packages(packages: List[str]) -> List[str]:
+    """Probe all packages concurrently and return the missing ones in input order."""
+    if not packages:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(packages))) as ex:
+        futures = {ex.submit(module_missing, pkg): pkg for pkg in packages}
+        missing = {futures[f] for f in as_completed(futures) if f.result()}
+    return [pkg for pkg in packages if pkg in missing]
+
+
+def run_install(packages: List[str], log: TextIO) -> int:
     """
-    Attempt to install packages quietly and return the CompletedProcess so we can log output.
+    Attempt to install packages quietly, streaming pip's output into the log as it
+    is produced, and return pip's exit code.
     """
-    cmd = [sys.executable, "-m", "pip", "install", "--upgrade", *packages]
-    return subprocess.run(cmd, capture_output=True, text=True, check=False)
+    cmd = [
+        sys.executable,
+        "-m",
+        "pip",
+        "install",
+        "--upgrade",
+        "--no-input",
+        "--disable-pip-version-check",
+        "--prefer-binary",
+        *packages,
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    log.write("pip output:\n")
+    for line in proc.stdout:
+        log.write(line)
+    return proc.wait()
+
+
+def open_log(log_file: Path) -> TextIO:
+    """
+    Open the install log for appending, line-buffered so pip output lands as it
+    streams; fall back to a null sink so installs still run.
+    """
+    try:
+        return log_file.open("a", encoding="utf-8", buffering=1)
+    except OSError:
+        return open(os.devnull, "w", encoding="utf-8")
 
 
+@functools.lru_cache(maxsize=None)
 def ffmpeg_available() -> bool:
     """Quick check for ffmpeg on PATH (needed by whisper)."""
-    try:
-        result = subprocess.run(
-            ["ffmpeg", "-version"], capture_output=True, text=True, timeout=5
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+    return shutil.which("ffmpeg") is not None
 
 
 def main() -> None:
     logs_dir = ensure_logs_dir()
     log_file = logs_dir / "whisper_dep_install.log"
 
-    def module_missing(pkg: str) -> bool:
-        """Return True if the import for this package fails."""
-        module_name = PACKAGE_TO_MODULE.get(pkg, pkg.replace("-", "_"))
-        try:
-            importlib.import_module(module_name)
-            return False
-        except Exception:
-            return True
-
-    # --- Required packages ---
+    # Probe required and optional packages in one concurrent batch
+    all_missing = missing_packages(REQUIRED_PACKAGES + OPTIONAL_PACKAGES)
     required_missing: List[str] = [
-        pkg for pkg in REQUIRED_PACKAGES if module_missing(pkg)
+        pkg for pkg in REQUIRED_PACKAGES if pkg in all_missing
     ]
-
-    ffmpeg_ok = ffmpeg_available()
-    timestamp = datetime.datetime.now().isoformat(timespec="seconds")
-
-    proc_required: subprocess.CompletedProcess | None = None
-    if required_missing:
-        try:
-            proc_required = run_install(required_missing)
-        finally:
-            try:
-                with log_file.open("a", encoding="utf-8") as f:
-                    msg = (
-                        f"[{timestamp}] Attempted install of REQUIRED: "
-                        f"{', '.join(required_missing)} using {sys.executable}\n"
-                    )
-                    f.write(msg)
-                    f.write(f"ffmpeg available: {ffmpeg_ok}\n")
-                    if proc_required:
-                        f.write(f"pip return code: {proc_required.returncode}\n")
-                        if proc_required.stdout:
-                            f.write("pip stdout:\n")
-                            f.write(proc_required.stdout + "\n")
-                        if proc_required.stderr:
-                            f.write("pip stderr:\n")
-                            f.write(proc_required.stderr + "\n")
-                    f.write("\n")
-            except Exception:
-                pass
-    else:
-        # Nothing missing from required set – still log ffmpeg status for debugging
-        try:
-            with log_file.open("a", encoding="utf-8") as f:
-                f.write(
-                    f"[{timestamp}] REQUIRED packages already present. ffmpeg available: {ffmpeg_ok}\n\n"
-                )
-        except Exception:
-            pass
-
-    # --- Optional packages (best-effort; failures are logged but ignored) ---
     optional_missing: List[str] = [
-        pkg for pkg in OPTIONAL_PACKAGES if module_missing(pkg)
+        pkg for pkg in OPTIONAL_PACKAGES if pkg in all_missing
     ]
-    proc_optional: subprocess.CompletedProcess | None = None
-    if optional_missing:
-        try:
-            proc_optional = run_install(optional_missing)
-        finally:
-            try:
-                with log_file.open("a", encoding="utf-8") as f:
-                    msg = (
-                        f"[{timestamp}] Attempted install of OPTIONAL: "
-                        f"{', '.join(optional_missing)} using {sys.executable}\n"
-                    )
-                    f.write(msg)
-                    if proc_optional:
-                        f.write(f"pip return code: {proc_optional.returncode}\n")
-                        if proc_optional.stdout:
-                            f.write("pip stdout:\n")
-                            f.write(proc_optional.stdout + "\n")
-                        if proc_optional.stderr:
-                            f.write("pip stderr:\n")
-                            f.write(proc_optional.stderr + "\n")
-                    f.write("\n")
-            except Exception:
-                pass
+
+    ffmpeg_ok = ffmpeg_available()
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    required_failed = False
+    # One handle for the whole run
+    with open_log(log_file) as f:
+        if required_missing or optional_missing:
+            to_install = required_missing + optional_missing
+            f.write(
+                f"[{timestamp}] Attempted install of REQUIRED: "
+                f"{', '.join(required_missing) or '-'} OPTIONAL: "
+                f"{', '.join(optional_missing) or '-'} using {sys.executable}\n"
+            )
+            f.write(f"ffmpeg available: {ffmpeg_ok}\n")
+            # One pip run resolves everything together
+            returncode = run_install(to_install, f)
+            f.write(f"pip return code: {returncode}\n")
+
+            # Optional extras must never block required ones: if the combined
+            # install failed, retry with the required set alone.
+            if returncode != 0 and required_missing and optional_missing:
+                f.write(f"[{timestamp}] Retrying REQUIRED only: {', '.join(required_missing)}\n")
+                returncode = run_install(required_missing, f)
+                f.write(f"pip return code: {returncode}\n")
+
+            # Check what actually resolved (optional failures are logged but ignored)
+            importlib.invalidate_caches()
+            still_missing = missing_packages(to_install)
+            if still_missing:
+                f.write(f"Still missing after install: {', '.join(still_missing)}\n")
+            f.write("\n")
+            required_failed = any(pkg in still_missing for pkg in required_missing)
+        else:
+            # Nothing missing – still log ffmpeg status for debugging
+            f.write(
+                f"[{timestamp}] REQUIRED packages already present. ffmpeg available: {ffmpeg_ok}\n\n"
+            )
 
     # User-facing console hints (printed when running under python, not pythonw)
     if sys.stdout and sys.stdout.isatty():
@@ -167,7 +185,7 @@ def main() -> None:
             sys.stdout.write(
                 "ffmpeg is required for Whisper. Install it and ensure ffmpeg.exe is on your PATH.\n"
             )
-        if proc_required and proc_required.returncode != 0:
+        if required_failed:
             sys.stdout.write(
                 "Voice dependencies failed to install. See logs/whisper_dep_install.log for details.\n"
             )
@@ -4,26 +4,45 @@ import os
 # Add root to path so src can be imported
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from src.config import DATABASE_PATH
+from sqlalchemy import text
+from scripts._db import BOARD_NAME_INDEX_DDL
+from src.aac_app.models.database import get_session
+
+MAX_RESULTS = 50
+
+# Prefix match can range-scan idx_boards_name; the substring match has to scan the table
+PREFIX_QUERY = text(
+    "SELECT id, name, description FROM communication_boards "
+    "WHERE name LIKE :pattern ESCAPE '\\' ORDER BY name COLLATE NOCASE LIMIT :limit"
+)
+SUBSTRING_QUERY = text(
+    "SELECT id, name, description FROM communication_boards "
+    "WHERE name LIKE :pattern ESCAPE '\\' LIMIT :limit"
+)
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 def find_board(name):
-    engine = create_engine(f"sqlite:///{DATABASE_PATH}")
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    try:
-        # Use raw SQL for simplicity if models are complex to import or just use SQL alchemy
-        result = session.execute(text("SELECT id, name, description FROM communication_boards WHERE name LIKE :name"), {"name": f"%{name}%"})
-        boards = result.fetchall()
+    # Reuses the application's cached engine instead of building a new pool per call
+    with get_session() as session:
+        session.execute(text(BOARD_NAME_INDEX_DDL))
+        escaped = _escape_like(name)
+        boards = session.execute(
+            PREFIX_QUERY, {"pattern": f"{escaped}%", "limit": MAX_RESULTS}
+        ).fetchall()
+        if not boards:
+            boards = session.execute(
+                SUBSTRING_QUERY, {"pattern": f"%{escaped}%", "limit": MAX_RESULTS}
+            ).fetchall()
         if boards:
             print(f"Found {len(boards)} boards matching '{name}':")
             for b in boards:
                 print(f"ID: {b.id}, Name: {b.name}, Description: {b.description}")
         else:
             print(f"No boards found matching '{name}'")
-    finally:
-        session.close()
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
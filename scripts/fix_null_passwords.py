@@ -16,8 +16,11 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.aac_app.models.database import User, get_session  # noqa: E402
-from src.api.routers.auth import hash_password  # noqa: E402
+from sqlalchemy import case, func  # noqa: E402
+
+from scripts._db import MMAP_PRAGMAS, WRITE_PRAGMAS, use_sqlite_pragmas  # noqa: E402
+from src.aac_app.models.database import User, create_engine_instance, get_session  # noqa: E402
+from src.aac_app.services.auth_service import get_password_hash as hash_password  # noqa: E402
 
 
 def fix_null_password_hashes(delete_invalid=False):
@@ -31,8 +34,14 @@ def fix_null_password_hashes(delete_invalid=False):
     print("Checking for users with null password hashes...")
 
     with get_session() as session:
-        # Find users with null password hash
-        invalid_users = session.query(User).filter(User.password_hash.is_(None)).all()
+        null_password = User.password_hash.is_(None)
+
+        # Find users with null password hash (only the columns we print)
+        invalid_users = (
+            session.query(User.id, User.username, User.user_type)
+            .filter(null_password)
+            .all()
+        )
 
         if not invalid_users:
             print("✓ No users with null password hashes found.")
@@ -44,20 +53,24 @@ def fix_null_password_hashes(delete_invalid=False):
 
         if delete_invalid:
             print("\nDeleting invalid users...")
-            for user in invalid_users:
-                print(f"  Deleting user: {user.username}")
-                session.delete(user)
+            deleted = (
+                session.query(User)
+                .filter(null_password)
+                .delete(synchronize_session=False)
+            )
             session.commit()
-            print(f"✓ Deleted {len(invalid_users)} invalid users")
+            print(f"✓ Deleted {deleted} invalid users")
         else:
             print("\nSetting impossible password hash for invalid users...")
             print("(These users will not be able to login until password is reset)")
             impossible_hash = hash_password("__INVALID_USER_NO_PASSWORD__")
-            for user in invalid_users:
-                print(f"  Fixing user: {user.username}")
-                user.password_hash = impossible_hash
+            fixed = (
+                session.query(User)
+                .filter(null_password)
+                .update({User.password_hash: impossible_hash}, synchronize_session=False)
+            )
             session.commit()
-            print(f"✓ Fixed {len(invalid_users)} users")
+            print(f"✓ Fixed {fixed} users")
 
         return True
 
@@ -67,11 +80,14 @@ def validate_database():
     print("\nValidating database integrity...")
 
     with get_session() as session:
-        total_users = session.query(User).count()
-        users_with_passwords = (
-            session.query(User).filter(User.password_hash.is_not(None)).count()
-        )
-        users_without_passwords = total_users - users_with_passwords
+        # One scan: total and null-hash counts together
+        total_users, users_without_passwords = session.query(
+            func.count(User.id),
+            func.coalesce(
+                func.sum(case((User.password_hash.is_(None), 1), else_=0)), 0
+            ),
+        ).one()
+        users_with_passwords = total_users - users_without_passwords
 
         print(f"Total users: {total_users}")
         print(f"Users with passwords: {users_with_passwords}")
@@ -94,6 +110,8 @@ def main():
     print("=" * 60)
 
     try:
+        use_sqlite_pragmas(create_engine_instance(), *MMAP_PRAGMAS, *WRITE_PRAGMAS)
+
         # Fix null password hashes (delete invalid users)
         fix_null_password_hashes(delete_invalid=True)
 
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-import secrets
+import os
+import sys
 
 
 def main() -> int:
-    print(secrets.token_hex(32))
+    # os.urandom is what secrets.token_hex wraps; skip importing secrets/hmac/random
+    sys.stdout.write(os.urandom(32).hex() + "\n")
     return 0
 
 
@@ -12,21 +12,40 @@ if not os.path.exists(DB_PATH):
 
 conn = sqlite3.connect(DB_PATH)
 cursor = conn.cursor()
+# Map the file instead of read()-ing it page by page for the count scans
+cursor.execute("PRAGMA mmap_size=268435456")
+cursor.execute("PRAGMA cache_size=-65536")
 
 try:
     tables = ["users", "symbols", "achievements", "user_achievements", "communication_boards", "board_symbols"]
+    cursor.execute(
+        f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({', '.join('?' * len(tables))})",
+        tables,
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    present = [table for table in tables if table in existing]
+
+    counts = {}
+    if present:
+        # One round-trip for every count instead of one query per table
+        cursor.execute(
+            " UNION ALL ".join(f"SELECT '{table}', count(*) FROM {table}" for table in present)
+        )
+        counts = dict(cursor.fetchall())
+
     for table in tables:
-        try:
-            cursor.execute(f"SELECT count(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            print(f"Table '{table}': {count} rows")
-            
-            if count > 0 and table == "users":
-                cursor.execute("SELECT id, username, user_type FROM users")
-                print("Users:", cursor.fetchall())
-                
-        except sqlite3.OperationalError as e:
-            print(f"Table '{table}' error: {e}")
+        if table not in counts:
+            print(f"Table '{table}' error: no such table: {table}")
+            continue
+
+        count = counts[table]
+        print(f"Table '{table}': {count} rows")
+
+        if count > 0 and table == "users":
+            # Stream rows off the cursor instead of materializing them all
+            print("Users:")
+            for row in cursor.execute("SELECT id, username, user_type FROM users"):
+                print(f"  {row}")
 
 except Exception as e:
     print(f"Error: {e}")
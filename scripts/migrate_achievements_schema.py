@@ -3,6 +3,11 @@ import os
 
 import sys
 
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts._db import INDEX_DDL, MMAP_PRAGMAS, WRITE_PRAGMAS  # noqa: E402
+
 # Default path relative to script
 DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "aac_assistant.db")
 
@@ -15,6 +20,8 @@ def migrate(db_path=None):
 
     conn = sqlite3.connect(target_db)
     cursor = conn.cursor()
+    for pragma in MMAP_PRAGMAS + WRITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
 
     try:
         # Check if columns exist
@@ -22,6 +29,9 @@ def migrate(db_path=None):
         columns = [info[1] for info in cursor.fetchall()]
         print(f"Current columns: {columns}")
 
+        # sqlite3 does not open a transaction for DDL; group every change into one commit
+        cursor.execute("BEGIN")
+
         if "created_by" not in columns:
             print("Adding created_by...")
             cursor.execute("ALTER TABLE achievements ADD COLUMN created_by INTEGER REFERENCES users(id)")
@@ -40,10 +50,16 @@ def migrate(db_path=None):
         else:
             print("is_manual already exists")
 
+        # Lookup indexes older databases may be missing
+        for ddl in INDEX_DDL:
+            cursor.execute(ddl)
+
         conn.commit()
         print("Migration complete!")
         
     except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
         print(f"Migration failed: {e}")
     finally:
         conn.close()
@@ -1,36 +1,63 @@
+import argparse
 import os
 import sys
 
 # Add the project root to the python path
 sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import or_, text, update  # noqa: E402
+
+from scripts._db import SYMBOL_IMAGE_PATH_INDEX_DDL  # noqa: E402
 from src.aac_app.models.database import Symbol, get_session  # noqa: E402
 
+# Where imported ARASAAC images live: the import endpoint saves them as
+# /uploads/symbols/arasaac_<id>_<suffix>.png; older rows may point at the CDN.
+ARASAAC_PATH_PREFIXES = ("/uploads/symbols/arasaac_", "https://static.arasaac.org/")
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def arasaac_path_filter():
+    """Anchored prefix LIKEs, which SQLite can answer from ix_symbol_image_path."""
+    return or_(
+        *(
+            Symbol.image_path.like(f"{_escape_like(prefix)}%", escape="\\")
+            for prefix in ARASAAC_PATH_PREFIXES
+        )
+    )
 
-def check_and_migrate_arasaac_symbols():
+
+def check_and_migrate_arasaac_symbols(verbose=False):
     print("Checking for ARASAAC symbols...")
     with get_session() as session:
-        # Find symbols that have 'arasaac' in their image path or are from arasaac import
-        # We'll look for 'arasaac' in the image_path as a heuristic,
-        # or if we can identify them another way.
-        # The user said "imported symbols currently default to 'general'".
-
-        # Let's look for symbols with image_path containing 'arasaac'
-        symbols = (
-            session.query(Symbol).filter(Symbol.image_path.like("%arasaac%")).all()
-        )
+        # Imported symbols currently default to 'general'; identify ARASAAC ones
+        # by a known image_path prefix.
+        session.execute(text(SYMBOL_IMAGE_PATH_INDEX_DDL))
 
-        print(f"Found {len(symbols)} symbols with 'arasaac' in image_path.")
+        if verbose:
+            # Listing needs the rows; the migration itself below does not
+            rows = session.query(
+                Symbol.label, Symbol.category, Symbol.image_path
+            ).filter(arasaac_path_filter())
+            # Build the listing first and write it once, not one print per symbol
+            lines = []
+            for label, category, image_path in rows:
+                lines.append(f"Symbol: {label}, Category: {category}, Path: {image_path}")
+                if category == "general":
+                    lines.append(f"  -> Migrating '{label}' to category 'ARASAAC'")
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
 
-        migrated_count = 0
-        for symbol in symbols:
-            print(
-                f"Symbol: {symbol.label}, Category: {symbol.category}, Path: {symbol.image_path}"
-            )
-            if symbol.category == "general":
-                print(f"  -> Migrating '{symbol.label}' to category 'ARASAAC'")
-                symbol.category = "ARASAAC"
-                migrated_count += 1
+        # One UPDATE ... WHERE, no ORM objects loaded or tracked
+        result = session.execute(
+            update(Symbol.__table__)
+            .where(arasaac_path_filter(), Symbol.category == "general")
+            .values(category="ARASAAC")
+        )
+        migrated_count = result.rowcount
 
         if migrated_count > 0:
             session.commit()
@@ -42,4 +69,14 @@ def check_and_migrate_arasaac_symbols():
 
 
 if __name__ == "__main__":
-    check_and_migrate_arasaac_symbols()
+    parser = argparse.ArgumentParser(
+        description="Move imported ARASAAC symbols from 'general' to the 'ARASAAC' category"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        default=bool(os.environ.get("AAC_VERBOSE")),
+        help="List every ARASAAC symbol before migrating (default: $AAC_VERBOSE)",
+    )
+    args = parser.parse_args()
+    check_and_migrate_arasaac_symbols(verbose=args.verbose)
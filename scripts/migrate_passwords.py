@@ -3,17 +3,24 @@ Password migration utility for AAC Assistant.
 
 This script migrates user password hashes from legacy SHA-256 to bcrypt.
 Because hashes are one-way, affected users are assigned one temporary
-password that must be rotated immediately after migration.
+password that must be rotated immediately after migration. With
+--per-user-temp, each user instead gets a random password written to a
+private CSV file.
 """
 
 import argparse
+import csv
 import os
 import re
+import secrets
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import bcrypt
 from loguru import logger
+from sqlalchemy import and_, bindparam, case, func, update
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -22,6 +29,13 @@ sys.path.insert(0, str(project_root))
 from src.aac_app.models.database import User, get_session
 
 TEMP_PASSWORD_ENV = "AAC_MIGRATION_TEMP_PASSWORD"
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# Stay well under SQLite's bound-parameter limit for IN (...) lists
+MAX_PARAMS = 500
+# Pinned bcrypt cost (gensalt()'s default has drifted between releases); 12 matches
+# what auth_service gets today, so migrated accounts are no weaker than regular ones.
+BCRYPT_ROUNDS = int(os.getenv("AAC_BCRYPT_ROUNDS", "12"))
+BCRYPT_TARGET_MS = float(os.getenv("AAC_BCRYPT_TARGET_MS", "300"))
 
 
 def _password_is_strong(password: str) -> bool:
@@ -49,15 +63,98 @@ def _resolve_temp_password(cli_temp_password: str | None) -> str:
     return temp_password
 
 
-def migrate_passwords(temp_password: str, skip_confirmation: bool = False) -> None:
+def _check_bcrypt_cost() -> None:
+    """Time one hash at BCRYPT_ROUNDS and warn if this machine is slower than the budget."""
+    started = time.perf_counter()
+    bcrypt.hashpw(b"probe", bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms > BCRYPT_TARGET_MS:
+        logger.warning(
+            f"bcrypt cost {BCRYPT_ROUNDS} takes {elapsed_ms:.0f} ms per hash here "
+            f"(target {BCRYPT_TARGET_MS:.0f} ms); consider a lower AAC_BCRYPT_ROUNDS."
+        )
+
+
+def _hash_temp_password(temp_password: str) -> str:
+    """
+    bcrypt-hash a temp password at BCRYPT_ROUNDS. The shared temp password is
+    hashed once per migration run, never per user; --per-user-temp runs this in
+    worker processes, so it stays a module-level function.
+    """
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(temp_password.encode("utf-8"), salt).decode("utf-8")
+
+
+def _is_bcrypt():
+    """SQL predicate: hash carries a bcrypt $2a$/$2b$/$2y$ prefix."""
+    return func.substr(User.password_hash, 1, 4).in_(BCRYPT_PREFIXES)
+
+
+def _is_sha256():
+    """SQL predicate: hash is a legacy SHA-256 digest, i.e. exactly 64 hex digits of either case."""
+    return and_(
+        func.length(User.password_hash) == 64,
+        User.password_hash.op("NOT GLOB")("*[^0-9a-fA-F]*"),
+    )
+
+
+def _write_credentials(path: Path, rows) -> None:
+    """Write username,password rows to a file only the current user can read."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    if hasattr(os, "fchmod"):
+        # The mode above only applies when the file is created; tighten an existing
+        # one (a rerun, or a 0644 file) before any plaintext goes into it
+        os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["username", "temporary_password"])
+        writer.writerows(rows)
+
+
+def _assign_per_user_passwords(db, users, output_path: Path) -> int:
+    """
+    Give every user a unique random temp password. bcrypt is CPU-bound, so the
+    hashes are computed across processes, then stored with one executemany UPDATE.
+    """
+    passwords = [secrets.token_urlsafe(16) for _ in users]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        hashes = list(ex.map(_hash_temp_password, passwords, chunksize=8))
+
+    # Persist the plaintexts before touching the DB so nobody is locked out
+    _write_credentials(
+        output_path, [(user.username, pw) for user, pw in zip(users, passwords)]
+    )
+
+    users_table = User.__table__
+    result = db.execute(
+        update(users_table)
+        .where(users_table.c.id == bindparam("uid"))
+        .values(password_hash=bindparam("pw_hash")),
+        [{"uid": user.id, "pw_hash": pw_hash} for user, pw_hash in zip(users, hashes)],
+    )
+    return result.rowcount
+
+
+def migrate_passwords(
+    temp_password: str | None,
+    skip_confirmation: bool = False,
+    per_user_output: Path | None = None,
+) -> None:
     """
     Migrate users that still store SHA-256 hashes to bcrypt.
+
+    With per_user_output set, each user gets a unique random temp password
+    (written to that file) instead of the shared temp_password.
     """
     logger.info("=" * 80)
     logger.info("PASSWORD MIGRATION SCRIPT")
     logger.info("=" * 80)
-    logger.warning("This operation resets all SHA-256 user hashes to one temp password.")
-    logger.warning("The temporary password value is intentionally not logged.")
+    if per_user_output is not None:
+        logger.warning("This operation resets all SHA-256 user hashes to per-user temp passwords.")
+        logger.warning(f"Temporary passwords are written only to {per_user_output}.")
+    else:
+        logger.warning("This operation resets all SHA-256 user hashes to one temp password.")
+        logger.warning("The temporary password value is intentionally not logged.")
     logger.info("=" * 80)
 
     if not skip_confirmation:
@@ -70,41 +167,50 @@ def migrate_passwords(temp_password: str, skip_confirmation: bool = False) -> No
 
     try:
         with get_session() as db:
-            users = db.query(User).all()
-
-            if not users:
-                logger.warning("No users found in database.")
+            # Fast path for the common re-run: one EXISTS probe, nothing loaded
+            if not db.query(db.query(User.id).filter(_is_sha256()).exists()).scalar():
+                logger.info("No users with SHA-256 hashes found; nothing to migrate.")
                 return
 
-            logger.info(f"Found {len(users)} users to evaluate")
-            salt = bcrypt.gensalt()
-            new_hash = bcrypt.hashpw(temp_password.encode("utf-8"), salt).decode("utf-8")
+            total_users = db.query(func.count(User.id)).scalar()
+            logger.info(f"Found {total_users} users to evaluate")
+
+            legacy_users = db.query(
+                User.id, User.username, User.user_type
+            ).filter(_is_sha256()).all()
 
             migrated_count = 0
-            for user in users:
-                old_hash = user.password_hash
-                is_sha256 = len(old_hash) == 64 and all(
-                    c in "0123456789abcdef" for c in old_hash.lower()
+            if legacy_users and per_user_output is not None:
+                migrated_count = _assign_per_user_passwords(
+                    db, legacy_users, per_user_output
                 )
+            elif legacy_users:
+                new_hash = _hash_temp_password(temp_password)
 
-                if is_sha256:
-                    user.password_hash = new_hash
-                    logger.info(
-                        f"Migrated user: {user.username} (id={user.id}, type={user.user_type})"
-                    )
-                    migrated_count += 1
-                else:
-                    logger.info(
-                        f"Skipped user: {user.username} (already bcrypt or unknown format)"
+                # Everyone gets the same hash, so one UPDATE per id batch
+                # replaces per-object dirty tracking and per-row UPDATEs.
+                ids = [user.id for user in legacy_users]
+                for start in range(0, len(ids), MAX_PARAMS):
+                    result = db.execute(
+                        update(User)
+                        .where(User.id.in_(ids[start:start + MAX_PARAMS]))
+                        .values(password_hash=new_hash)
+                        .execution_options(synchronize_session=False)
                     )
+                    migrated_count += result.rowcount
+
+            for user in legacy_users:
+                logger.info(
+                    f"Migrated user: {user.username} (id={user.id}, type={user.user_type})"
+                )
 
             db.commit()
 
             logger.info("=" * 80)
             logger.info("Migration complete.")
-            logger.info(f"Total users: {len(users)}")
+            logger.info(f"Total users: {total_users}")
             logger.info(f"Migrated: {migrated_count}")
-            logger.info(f"Skipped: {len(users) - migrated_count}")
+            logger.info(f"Skipped (already bcrypt or unknown format): {total_users - migrated_count}")
             logger.warning("Temporary passwords must be changed after first login.")
             logger.info("=" * 80)
     except Exception as exc:
@@ -121,24 +227,25 @@ def verify_migration() -> None:
 
     try:
         with get_session() as db:
-            users = db.query(User).all()
-
-            bcrypt_count = 0
-            sha256_count = 0
-            other_count = 0
-
-            for user in users:
-                hash_value = user.password_hash
-                if hash_value.startswith(("$2a$", "$2b$", "$2y$")):
-                    bcrypt_count += 1
-                elif len(hash_value) == 64 and all(
-                    c in "0123456789abcdef" for c in hash_value.lower()
-                ):
-                    sha256_count += 1
-                    logger.warning(f"{user.username}: SHA-256 format (not migrated)")
-                else:
-                    other_count += 1
-                    logger.warning(f"{user.username}: unknown hash format")
+            # The database aggregates; Python only sees three integers
+            total, bcrypt_count, sha256_count = db.query(
+                func.count(User.id),
+                func.coalesce(func.sum(case((_is_bcrypt(), 1), else_=0)), 0),
+                func.coalesce(func.sum(case((_is_sha256(), 1), else_=0)), 0),
+            ).one()
+            other_count = total - bcrypt_count - sha256_count
+
+            # Offender names are fetched only when there is something to report
+            if sha256_count:
+                for (username,) in db.query(User.username).filter(_is_sha256()):
+                    logger.warning(f"{username}: SHA-256 format (not migrated)")
+            if other_count:
+                unknown = db.query(User.username).filter(
+                    ~func.coalesce(_is_bcrypt(), False),
+                    ~func.coalesce(_is_sha256(), False),
+                )
+                for (username,) in unknown:
+                    logger.warning(f"{username}: unknown hash format")
 
             logger.info("=" * 80)
             logger.info("VERIFICATION RESULTS")
@@ -169,6 +276,15 @@ if __name__ == "__main__":
         action="store_true",
         help="Skip interactive confirmation prompt",
     )
+    parser.add_argument(
+        "--per-user-temp",
+        metavar="CSV_PATH",
+        type=Path,
+        help=(
+            "Give each migrated user a unique random temp password instead of a "
+            "shared one, and write username,password rows to CSV_PATH (mode 0600)."
+        ),
+    )
     parser.add_argument(
         "--temp-password",
         help=(
@@ -180,11 +296,18 @@ if __name__ == "__main__":
 
     if args.verify_only:
         verify_migration()
+    elif args.per_user_temp:
+        _check_bcrypt_cost()
+        migrate_passwords(
+            None, skip_confirmation=args.yes, per_user_output=args.per_user_temp
+        )
+        verify_migration()
     else:
         try:
             temporary_password = _resolve_temp_password(args.temp_password)
         except ValueError as exc:
             logger.error(str(exc))
             sys.exit(2)
+        _check_bcrypt_cost()
         migrate_passwords(temporary_password, skip_confirmation=args.yes)
         verify_migration()
@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+import sqlite3
 from pathlib import Path
 
 # Setup logging
@@ -11,6 +12,31 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 sys.path.append(str(PROJECT_ROOT))
 
+# VACUUM INTO arrived in SQLite 3.27
+HAS_VACUUM_INTO = sqlite3.sqlite_version_info >= (3, 27, 0)
+MEMORY_DATABASE_URL = "sqlite:///:memory:"
+
+
+def _init_in_memory_then_copy(database, db_path):
+    """
+    Build schema and seed data in an in-memory database, then write it to
+    db_path in one pass with VACUUM INTO (no per-commit fsync on the file).
+    """
+    previous_url = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = MEMORY_DATABASE_URL
+    try:
+        database.init_database()
+        engine = database.create_engine_instance()
+        target = str(db_path).replace("'", "''")
+        with engine.connect() as conn:
+            conn.exec_driver_sql(f"VACUUM INTO '{target}'")
+    finally:
+        if previous_url is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = previous_url
+
+
 def prepare_db(target_dir):
     """Initialize a test database in the target directory"""
     target_path = Path(target_dir)
@@ -45,7 +71,10 @@ def prepare_db(target_dir):
         database.get_database_path = lambda: str(db_path)
         
         # Run initialization (creates tables and seed data)
-        database.init_database()
+        if HAS_VACUUM_INTO:
+            _init_in_memory_then_copy(database, db_path)
+        else:
+            database.init_database()
         
         # Verify creation
         if db_path.exists():
@@ -1,32 +1,134 @@
+import csv
 import os
 import sqlite3
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import bcrypt
 
-def reset_password(username, new_password):
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# Stay well under SQLite's bound-parameter limit for IN (...) lists
+MAX_PARAMS = 500
+# Pinned bcrypt cost; gensalt()'s default has drifted between bcrypt releases
+BCRYPT_ROUNDS = int(os.getenv("AAC_BCRYPT_ROUNDS", "12"))
+BCRYPT_TARGET_MS = float(os.getenv("AAC_BCRYPT_TARGET_MS", "300"))
+
+
+def _connect():
     db_path = os.path.join("data", "aac_assistant.db")
     if not os.path.exists(db_path):
         print(f"DB not found at {db_path}")
+        return None
+
+    # IMMEDIATE: take the write lock up front so a bulk reset is one transaction
+    conn = sqlite3.connect(db_path, isolation_level="IMMEDIATE")
+    # Connection-scoped only; journal_mode is left alone because WAL would persist
+    # in the application's database file after this one-off script exits
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _existing_usernames(conn, usernames):
+    found = set()
+    for start in range(0, len(usernames), MAX_PARAMS):
+        batch = usernames[start:start + MAX_PARAMS]
+        placeholders = ", ".join("?" * len(batch))
+        found.update(
+            row[0]
+            for row in conn.execute(
+                f"SELECT username FROM users WHERE username IN ({placeholders})", batch
+            )
+        )
+    return found
+
+
+def set_password_hashes(pairs):
+    """Store (username, bcrypt_hash) pairs in a single transaction."""
+    conn = _connect()
+    if conn is None:
         return
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+    try:
+        found = _existing_usernames(conn, [username for username, _ in pairs])
+        with conn:
+            conn.executemany(
+                "UPDATE users SET password_hash = ? WHERE username = ?",
+                [(hashed, username) for username, hashed in pairs if username in found],
+            )
+        for username, _ in pairs:
+            if username in found:
+                print(f"Password for {username} updated successfully.")
+            else:
+                print(f"User {username} not found.")
+    finally:
+        conn.close()
+
+
+def set_password_hash(usernames, hashed):
+    """Store one precomputed bcrypt hash for every username in a single transaction."""
+    set_password_hashes([(username, hashed) for username in usernames])
+
+
+def _check_bcrypt_cost():
+    """Time one hash at BCRYPT_ROUNDS and warn if this machine is slower than the budget."""
+    started = time.perf_counter()
+    bcrypt.hashpw(b"probe", bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms > BCRYPT_TARGET_MS:
+        print(
+            f"Warning: bcrypt cost {BCRYPT_ROUNDS} takes {elapsed_ms:.0f} ms per hash here "
+            f"(target {BCRYPT_TARGET_MS:.0f} ms); consider a lower AAC_BCRYPT_ROUNDS."
+        )
+
+
+def _hash_password(password):
     # Passlib might be having issues with python 3.13 / bcrypt version mismatch
     # Let's use raw bcrypt
-    hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-    
-    cursor.execute("UPDATE users SET password_hash = ? WHERE username = ?", (hashed, username))
-    if cursor.rowcount == 0:
-        print(f"User {username} not found.")
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+
+
+def reset_passwords(pairs):
+    """Reset (username, password) pairs with one transaction for the whole batch."""
+    passwords = [password for _, password in pairs]
+    if len(passwords) <= 1:
+        # Not worth a process pool's startup cost
+        hashes = [_hash_password(password) for password in passwords]
     else:
-        print(f"Password for {username} updated successfully.")
-        conn.commit()
-    
-    conn.close()
+        # bcrypt is CPU-bound; spread the hashes across cores
+        with ProcessPoolExecutor() as ex:
+            hashes = list(ex.map(_hash_password, passwords, chunksize=4))
+    set_password_hashes([(username, hashed) for (username, _), hashed in zip(pairs, hashes)])
+
+
+def reset_password(username, new_password):
+    reset_passwords([(username, new_password)])
+
+
+def _read_csv_pairs(stream):
+    return [
+        (row[0].strip(), row[1])
+        for row in csv.reader(stream)
+        if len(row) >= 2 and row[0].strip()
+    ]
+
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
+    if len(sys.argv) >= 3 and sys.argv[1] == "--hash-stdin":
+        # Scripted mass resets: hash once elsewhere, pipe it in, skip bcrypt here
+        hashed = sys.stdin.readline().strip()
+        if not hashed.startswith(BCRYPT_PREFIXES):
+            print("Expected a bcrypt hash on stdin.")
+            sys.exit(1)
+        set_password_hash(sys.argv[2:], hashed)
+    elif len(sys.argv) == 2 and sys.argv[1] == "--csv-stdin":
+        # Bulk resets: "username,password" rows on stdin
+        _check_bcrypt_cost()
+        reset_passwords(_read_csv_pairs(sys.stdin))
+    elif len(sys.argv) != 3:
         print("Usage: python reset_user_password.py <username> <password>")
+        print("       python reset_user_password.py --hash-stdin <username> [<username> ...] < hash.txt")
+        print("       python reset_user_password.py --csv-stdin < users.csv")
     else:
         reset_password(sys.argv[1], sys.argv[2])
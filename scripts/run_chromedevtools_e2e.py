@@ -4,11 +4,23 @@ import os
 import re
 import sys
 import time
-from dataclasses import dataclass
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
 from typing import Any, Callable, Optional
 
 sys.path.insert(0, os.path.dirname(__file__))
-from cdp_harness import CDP, get_first_page_target  # noqa: E402
+from cdp_harness import CDP, IsolatedContext  # noqa: E402
+
+try:
+    import orjson
+
+    def _dump_report(obj: Any, f) -> None:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode())
+
+except ImportError:  # pragma: no cover - orjson is optional
+
+    def _dump_report(obj: Any, f) -> None:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
 
 
 @dataclass
@@ -28,6 +40,14 @@ def _account_from_env(prefix: str) -> Account:
     return Account(username, password)
 
 
+@dataclass(slots=True)
+class StepResult:
+    name: str
+    ok: bool
+    seconds: float
+    error: Optional[str] = None
+
+
 STUDENT = _account_from_env("STUDENT")
 TEACHER = _account_from_env("TEACHER")
 ADMIN = _account_from_env("ADMIN")
@@ -41,24 +61,41 @@ class StepFailed(Exception):
     pass
 
 
-async def assert_path(cdp: CDP, pattern: str, timeout_s: float = 10):
-    regex = re.compile(pattern)
-    start = time.time()
-    while time.time() - start < timeout_s:
-        path = await cdp.eval("location.pathname", await_promise=False)
-        if isinstance(path, str) and regex.search(path):
-            return
-        await asyncio.sleep(0.2)
-    raise StepFailed(f"Expected path /{pattern}/, got {await cdp.eval('location.pathname', await_promise=False)}")
+# Paths asserted after navigation, compiled once
+_PATH_ROOT = re.compile(r"^/$")
+_PATH_LOGIN = re.compile(r"^/login$")
+_PATH_COMMUNICATION = re.compile(r"^/communication")
+_PATH_LEARNING = re.compile(r"^/learning")
+_PATH_SYMBOL_HUNT = re.compile(r"^/symbol-hunt")
+_PATH_BOARD_DETAIL = re.compile(r"^/boards/")
+_PATH_BOARDS = re.compile(r"^/boards$")
+
+# Page snippets with no per-call parameters, built once
+_JS_CLICK_THIS = "function() { this.click(); }"
+_JS_TOGGLE_NOTIFICATIONS = """(() => {
+  const candidates = Array.from(document.querySelectorAll("button,[role=button]"));
+  const bell = candidates.find(e => /notific/i.test(e.getAttribute("aria-label")||"") || /bell/i.test(e.innerText||""));
+  if (!bell) return false;
+  bell.click();
+  return true;
+})()"""
+
+
+async def assert_path(cdp: CDP, pattern: str | re.Pattern[str], timeout_s: float = 10):
+    # Driven by Page navigation events rather than a 200 ms eval poll
+    matched, last_path = await cdp.wait_for_path(pattern, timeout_s=timeout_s)
+    if not matched:
+        source = pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+        raise StepFailed(f"Expected path /{source}/, got {last_path}")
 
 
 async def login(cdp: CDP, account: Account):
-    await cdp.goto("http://localhost:8086/login")
+    await cdp.goto("http://localhost:8086/login", wait_for_load=True)
     await cdp.wait_for_selector("#username", timeout_s=15)
     await cdp.set_value("#username", account.username)
     await cdp.set_value("#password", account.password)
     await cdp.click_text(r"(Iniciar sesi|Login)", tag="button")
-    await assert_path(cdp, r"^/$", timeout_s=15)
+    await assert_path(cdp, _PATH_ROOT, timeout_s=15)
 
 
 async def logout(cdp: CDP):
@@ -72,74 +109,52 @@ async def logout(cdp: CDP):
             await cdp.click_text(r"Cerrar sesi", tag="a")
         except Exception:
             await cdp.click_text(r"Cerrar sesi", tag="*")
-    await assert_path(cdp, r"^/login$", timeout_s=15)
+    await assert_path(cdp, _PATH_LOGIN, timeout_s=15)
 
 
 async def register_user(cdp: CDP, *, role: str) -> Account:
     suffix = _now_id()[-6:]
     acc = Account(f"e2e_{role}_{suffix}", f"E2ePass_{suffix}!")
-    await cdp.goto("http://localhost:8086/register")
+    await cdp.goto("http://localhost:8086/register", wait_for_load=True)
     await cdp.wait_for_selector("#username", timeout_s=15)
     await cdp.set_value("#username", acc.username)
     await cdp.set_value("#password", acc.password)
     await cdp.set_value("#displayName", f"E2E {role} {suffix}")
     # Select role radio
-    await cdp.eval(
-        f"""(() => {{
-  const el = Array.from(document.querySelectorAll("input[type=radio]")).find(x => x.value === {json.dumps(role)});
-  if (!el) return false;
-  el.click();
-  return true;
-}})()""",
-        await_promise=False,
-    )
+    radio = await cdp.query_selector(f"input[type=radio][value={json.dumps(role)}]")
+    if radio:
+        await cdp.call_on(radio, _JS_CLICK_THIS)
     await cdp.click_text(r"Crear Cuenta", tag="button")
     # Registration redirects back to login (no auto-login).
-    await assert_path(cdp, r"^/login$", timeout_s=15)
+    await assert_path(cdp, _PATH_LOGIN, timeout_s=15)
     return acc
 
 
 async def nav_quick_actions(cdp: CDP):
     # Dashboard quick actions links in sidebar are stable
     await cdp.click_text(r"Comunicación", tag="a")
-    await assert_path(cdp, r"^/communication", timeout_s=10)
+    await assert_path(cdp, _PATH_COMMUNICATION, timeout_s=10)
     await cdp.click_text(r"Aprendizaje", tag="a")
-    await assert_path(cdp, r"^/learning", timeout_s=10)
+    await assert_path(cdp, _PATH_LEARNING, timeout_s=10)
     await cdp.click_text(r"Symbol Hunt", tag="a")
-    await assert_path(cdp, r"^/symbol-hunt", timeout_s=10)
+    await assert_path(cdp, _PATH_SYMBOL_HUNT, timeout_s=10)
     await cdp.click_text(r"Panel", tag="a")
-    await assert_path(cdp, r"^/$", timeout_s=10)
+    await assert_path(cdp, _PATH_ROOT, timeout_s=10)
 
 
 async def dashboard_recent_board(cdp: CDP):
     # If there are board cards, click the first one (by link to /boards/)
-    ok = await cdp.eval(
-        """(() => {
-  const a = Array.from(document.querySelectorAll("a")).find(x => (x.getAttribute("href")||"").startsWith("/boards/"));
-  if (!a) return false;
-  a.click();
-  return true;
-})()""",
-        await_promise=False,
-    )
-    if ok:
-        await assert_path(cdp, r"^/boards/", timeout_s=10)
+    link = await cdp.query_selector('a[href^="/boards/"]')
+    if link:
+        await cdp.call_on(link, _JS_CLICK_THIS)
+        await assert_path(cdp, _PATH_BOARD_DETAIL, timeout_s=10)
         await cdp.click_text(r"Tableros", tag="a")
-        await assert_path(cdp, r"^/boards$", timeout_s=10)
+        await assert_path(cdp, _PATH_BOARDS, timeout_s=10)
 
 
 async def notifications_panel(cdp: CDP):
     # Toggle notification panel (bell icon) if present
-    await cdp.eval(
-        """(() => {
-  const candidates = Array.from(document.querySelectorAll("button,[role=button]"));
-  const bell = candidates.find(e => /notific/i.test(e.getAttribute("aria-label")||"") || /bell/i.test(e.innerText||""));
-  if (!bell) return false;
-  bell.click();
-  return true;
-})()""",
-        await_promise=False,
-    )
+    await cdp.eval(_JS_TOGGLE_NOTIFICATIONS, await_promise=False)
 
 
 async def offline_mode_create_and_sync_board(cdp: CDP):
@@ -152,9 +167,10 @@ async def offline_mode_create_and_sync_board(cdp: CDP):
         await cdp.click_text(r"(Crear|Nuevo).*tablero", tag="button")
     except Exception:
         pass
-    await asyncio.sleep(1)
+    await cdp.wait_idle(timeout_s=5)
     await cdp.emulate_offline(False)
-    await asyncio.sleep(2)
+    # Give the app's online handler a moment to start syncing, then let it finish
+    await cdp.wait_idle(quiet_s=0.5, timeout_s=10)
     # Ensure app is still responsive
     await cdp.eval("Boolean(document.body)", await_promise=False)
 
@@ -164,29 +180,33 @@ async def edge_cases(cdp: CDP):
     await cdp.wait_for_js("document.body && document.body.innerText.length>0", timeout_s=10)
     await cdp.goto("http://localhost:8086/teachers")
     # For students, this should redirect away or show unauthorized
-    await asyncio.sleep(1)
+    await cdp.wait_idle(timeout_s=5)
 
 
-async def run() -> list[dict[str, Any]]:
-    results: list[dict[str, Any]] = []
+async def run(results: list[StepResult]) -> list[BaseException]:
+    """Run every flow, appending step outcomes to results; returns the flows' failures."""
     created: dict[str, Account] = {}
 
     async def step(name: str, fn: Callable[[], Any]):
-        started = time.time()
+        # Monotonic clock: wall-clock adjustments can't skew step timings
+        started = time.perf_counter_ns()
         try:
             await fn()
-            results.append({"name": name, "ok": True, "seconds": round(time.time() - started, 2)})
+            results.append(StepResult(name, True, round((time.perf_counter_ns() - started) / 1e9, 2)))
         except Exception as e:
-            results.append({"name": name, "ok": False, "seconds": round(time.time() - started, 2), "error": str(e)})
+            results.append(StepResult(name, False, round((time.perf_counter_ns() - started) / 1e9, 2), str(e)))
             raise
 
-    target = get_first_page_target()
-    async with CDP(target.ws_url) as cdp:
+    async def open_page(stack: AsyncExitStack) -> CDP:
+        # Each flow gets its own browser context so logins don't share storage
+        context = await stack.enter_async_context(IsolatedContext())
+        target = await context.new_page()
+        cdp = await stack.enter_async_context(CDP(target.ws_url))
         await cdp.enable()
         await cdp.emulate_offline(False)
-        await cdp.clear_origin_data("http://localhost:8086")
+        return cdp
 
-        # Auth flows
+    async def student_flow(cdp: CDP):
         await step("login_student", lambda: login(cdp, STUDENT))
         await step("dashboard_quick_actions", lambda: nav_quick_actions(cdp))
         await step("dashboard_recent_board", lambda: dashboard_recent_board(cdp))
@@ -194,6 +214,8 @@ async def run() -> list[dict[str, Any]]:
         await step("edge_cases_student", lambda: edge_cases(cdp))
         await step("logout_student", lambda: logout(cdp))
 
+    async def register_flow(cdp: CDP):
+        # Register-then-login must stay on one page, in order
         async def _reg_student():
             created["new_student"] = await register_user(cdp, role="student")
             await login(cdp, created["new_student"])
@@ -207,31 +229,40 @@ async def run() -> list[dict[str, Any]]:
         await step("register_new_student", _reg_student)
         await step("register_new_teacher", _reg_teacher)
 
-        # Role logins
+    async def teacher_flow(cdp: CDP):
         await step("login_teacher", lambda: login(cdp, TEACHER))
         await step("offline_create_sync_board", lambda: offline_mode_create_and_sync_board(cdp))
         await step("logout_teacher", lambda: logout(cdp))
 
+    async def admin_flow(cdp: CDP):
         await step("login_admin", lambda: login(cdp, ADMIN))
         await step("logout_admin", lambda: logout(cdp))
 
-    return results
+    flows = [student_flow, register_flow, teacher_flow, admin_flow]
+    async with AsyncExitStack() as stack:
+        pages = [await open_page(stack) for _ in flows]
+        # Role flows are independent and all I/O-bound waits; run them side by side.
+        # Let every flow finish so the report is complete; main() surfaces the first failure.
+        outcomes = await asyncio.gather(
+            *(flow(cdp) for flow, cdp in zip(flows, pages)), return_exceptions=True
+        )
+    return [o for o in outcomes if isinstance(o, BaseException)]
 
 
 def main():
     os.environ.setdefault("PYTHONIOENCODING", "utf-8")
-    results: list[dict[str, Any]]
+    # Owned here so the report gets every step recorded, even when run() raises
+    results: list[StepResult] = []
     try:
-        results = asyncio.run(run())
-    except Exception:
-        # still write partial results if available
-        results = []
-        raise
+        errors = asyncio.run(run(results))
+        if errors:
+            raise errors[0]
     finally:
-        out = {"results": results, "passed": sum(1 for r in results if r.get("ok")), "failed": sum(1 for r in results if not r.get("ok"))}
+        passed = sum(1 for r in results if r.ok)
+        out = {"results": [asdict(r) for r in results], "passed": passed, "failed": len(results) - passed}
         os.makedirs("logs", exist_ok=True)
         with open(os.path.join("logs", "e2e_cdp_report.json"), "w", encoding="utf-8") as f:
-            json.dump(out, f, ensure_ascii=False, indent=2)
+            _dump_report(out, f)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ from pathlib import Path
 project_root = str(Path(__file__).parent.parent)
 sys.path.append(project_root)
 
+from sqlalchemy import func
+
 from src.aac_app.models.database import get_session, Symbol
 from loguru import logger
 
@@ -64,24 +66,34 @@ def seed_core_vocabulary():
     ]
 
     with get_session() as session:
-        count = 0
-        for item in core_vocab:
-            # Check if exists (case insensitive)
-            existing = session.query(Symbol).filter(Symbol.label.ilike(item["label"])).first()
-            if not existing:
-                new_symbol = Symbol(
-                    label=item["label"],
-                    category=item["category"],
-                    keywords=item["keywords"],
-                    is_builtin=True,
-                    language="en"
-                )
-                session.add(new_symbol)
-                count += 1
-                logger.info(f"Added symbol: {item['label']}")
-        
+        # One case-insensitive lookup for the whole list instead of one query per label
+        wanted = {item["label"].lower(): item for item in core_vocab}
+        existing = {
+            row[0]
+            for row in session.query(func.lower(Symbol.label))
+            .filter(func.lower(Symbol.label).in_(list(wanted)))
+            .all()
+        }
+
+        to_insert = []
+        for key, item in wanted.items():
+            if key in existing:
+                continue
+            to_insert.append(
+                {
+                    "label": item["label"],
+                    "category": item["category"],
+                    "keywords": item["keywords"],
+                    "is_builtin": True,
+                    "language": "en",
+                }
+            )
+            logger.info(f"Added symbol: {item['label']}")
+
+        if to_insert:
+            session.bulk_insert_mappings(Symbol, to_insert)
         session.commit()
-        logger.success(f"Successfully added {count} core vocabulary symbols")
+        logger.success(f"Successfully added {len(to_insert)} core vocabulary symbols")
 
 if __name__ == "__main__":
     seed_core_vocabulary()
@@ -37,23 +37,32 @@ def update_sample_passwords():
         "admin1": _resolve_password("admin1"),
     }
 
-    with get_session() as db:
-        updated = 0
-        for username, new_password in password_updates.items():
-            user = db.query(User).filter(User.username == username).first()
-            if user:
-                user.password_hash = get_password_hash(new_password)
-                print(f"Updated password for {username}")
-                updated += 1
-            else:
-                print(f"User {username} not found")
+    # bcrypt is slow; hash before opening the session so the write transaction stays short
+    hashes = {username: get_password_hash(password) for username, password in password_updates.items()}
 
+    with get_session() as db:
+        user_ids = dict(
+            db.query(User.username, User.id).filter(User.username.in_(list(password_updates))).all()
+        )
+        db.bulk_update_mappings(
+            User,
+            [
+                {"id": user_ids[username], "password_hash": hashes[username]}
+                for username in password_updates
+                if username in user_ids
+            ],
+        )
         db.commit()
-        print(f"\nUpdated {updated} user passwords")
-        print("\nUpdated credentials (store them securely):")
-        for username, password in password_updates.items():
-            print(f"  {username} / {password}")
 
+    for username in password_updates:
+        if username in user_ids:
+            print(f"Updated password for {username}")
+        else:
+            print(f"User {username} not found")
+    print(f"\nUpdated {len(user_ids)} user passwords")
+    print("\nUpdated credentials (store them securely):")
+    for username, password in password_updates.items():
+        print(f"  {username} / {password}")
 
 if __name__ == "__main__":
     if "--force" not in sys.argv:
@@ -24,8 +24,11 @@ def validate_user_passwords() -> bool:
     print("Validating user passwords...")
 
     with get_session() as session:
+        # Only the columns that get printed; no need to hydrate full User rows
         users_without_passwords = (
-            session.query(User).filter(User.password_hash == None).all()  # noqa: E711
+            session.query(User.username, User.id)
+            .filter(User.password_hash == None)  # noqa: E711
+            .all()
         )
 
         if users_without_passwords:
@@ -47,11 +50,16 @@ def validate_default_users() -> bool:
     expected_users = ["student1", "teacher1", "admin1"]
 
     with get_session() as session:
+        # username -> password_hash for every expected user, in one query
+        password_hashes = dict(
+            session.query(User.username, User.password_hash)
+            .filter(User.username.in_(expected_users))
+            .all()
+        )
         for username in expected_users:
-            user = session.query(User).filter(User.username == username).first()
-            if not user:
+            if username not in password_hashes:
                 print(f"[WARN] Default user '{username}' not found")
-            elif not user.password_hash:
+            elif not password_hashes[username]:
                 print(f"[ERROR] Default user '{username}' has no password hash")
                 return False
             else:
@@ -60,32 +68,44 @@ def validate_default_users() -> bool:
         return True
 
 
+def _users_columns(engine) -> dict[str, bool] | None:
+    """Map users column name -> nullable, or None when the table is missing."""
+    from sqlalchemy import inspect, text
+
+    if engine.dialect.name == "sqlite":
+        # One PRAGMA answers both questions; it returns no rows for a missing table
+        with engine.connect() as conn:
+            rows = conn.execute(text("PRAGMA table_info(users)")).all()
+        return {row.name: not row.notnull for row in rows} or None
+
+    inspector = inspect(engine)
+    if not inspector.has_table("users"):
+        return None
+    return {col["name"]: col.get("nullable", True) for col in inspector.get_columns("users")}
+
+
 def validate_database_schema() -> bool:
     """Validate that core DB schema exists."""
-    from sqlalchemy import inspect
-
     from src.aac_app.models.database import create_engine_instance
 
     print("Validating database schema...")
 
     try:
         engine = create_engine_instance()
-        inspector = inspect(engine)
+        columns = _users_columns(engine)
 
-        if "users" not in inspector.get_table_names():
+        if columns is None:
             print("[ERROR] 'users' table not found")
             print(
                 "Fix: Run 'python -c \"from src.aac_app.models.database import init_database; init_database()\"'"
             )
             return False
 
-        columns = {col["name"]: col for col in inspector.get_columns("users")}
         if "password_hash" not in columns:
             print("[ERROR] 'password_hash' column not found in users table")
             return False
 
-        password_hash_col = columns["password_hash"]
-        if password_hash_col.get("nullable", True):
+        if columns["password_hash"]:
             print("[WARN] 'password_hash' is nullable; stricter schema is recommended")
 
         print("[OK] Database schema")
@@ -1,16 +1,30 @@
 
+import hashlib
+import io
 import os
 import sys
-import time
-import subprocess
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 
+import pytest
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src import config
 
+
+def _fingerprint(db_path):
+    """(size, mtime_ns, blake2b digest): also catches rewrites that keep size and mtime."""
+    st = db_path.stat()
+    digest = hashlib.blake2b()
+    with open(db_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return st.st_size, st.st_mtime_ns, digest.hexdigest()
+
+
 def verify_isolation():
     db_path = config.DATABASE_PATH
     print(f"Database path: {db_path}")
@@ -24,26 +38,25 @@ def verify_isolation():
 
     initial_stat = None
     if db_path.exists():
-        initial_stat = db_path.stat()
-        print(f"Initial size: {initial_stat.st_size}, mtime: {initial_stat.st_mtime}")
+        initial_stat = _fingerprint(db_path)
+        print(f"Initial size: {initial_stat[0]}, mtime_ns: {initial_stat[1]}")
     else:
         print("Database file not found initially.")
 
     print("\nRunning tests...")
-    # Run a simple test that involves DB operations
-    result = subprocess.run(
-        [sys.executable, "-m", "pytest", "tests/test_api_basic.py", "-v"],
-        capture_output=True,
-        text=True
-    )
-    
+    # Run a simple test that involves DB operations; in-process, so the app's
+    # imports are not paid for again in a child interpreter
+    out, err = io.StringIO(), io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        returncode = pytest.main([str(project_root / "tests" / "test_api_basic.py"), "-v"])
+
     print("Test output:")
-    print(result.stdout)
-    if result.stderr:
+    print(out.getvalue())
+    if err.getvalue():
         print("Test errors:")
-        print(result.stderr)
-        
-    if result.returncode != 0:
+        print(err.getvalue())
+
+    if returncode != 0:
         print("Tests failed!")
         # We continue to check isolation anyway
     
@@ -56,11 +69,11 @@ def verify_isolation():
              print("✓ Database file still doesn't exist (good).")
              return True
 
-    final_stat = db_path.stat()
-    print(f"Final size: {final_stat.st_size}, mtime: {final_stat.st_mtime}")
+    final_stat = _fingerprint(db_path)
+    print(f"Final size: {final_stat[0]}, mtime_ns: {final_stat[1]}")
 
     if initial_stat:
-        if final_stat.st_mtime != initial_stat.st_mtime or final_stat.st_size != initial_stat.st_size:
+        if final_stat != initial_stat:
             print("❌ ERROR: Database file was MODIFIED during tests!")
             return False
         else:
@@ -70,6 +83,7 @@ def verify_isolation():
         print("❌ ERROR: Database file was CREATED during tests!")
         return False
 
+
 if __name__ == "__main__":
     success = verify_isolation()
     sys.exit(0 if success else 1)
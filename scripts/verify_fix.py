@@ -1,35 +1,19 @@
 import os
 import sys
 
-import requests
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts._verify_api import BASE_URL, SESSION, login  # noqa: E402
 
 # Configuration
-BASE_URL = os.environ.get("AAC_BASE_URL", "http://localhost:8086/api").rstrip("/")
-USERNAME = os.environ.get("AAC_VERIFY_USERNAME", "").strip()
-PASSWORD = os.environ.get("AAC_VERIFY_PASSWORD", "").strip()
 BOARD_ID = 8
 SYMBOL_LABEL = "horse"
 LINKED_BOARD_ID = 9  # Collab Board
 
-if not USERNAME or not PASSWORD:
-    raise SystemExit(
-        "Set AAC_VERIFY_USERNAME and AAC_VERIFY_PASSWORD before running this script."
-    )
-
-
-def login():
-    response = requests.post(
-        f"{BASE_URL}/auth/token", data={"username": USERNAME, "password": PASSWORD}
-    )
-    if response.status_code != 200:
-        print(f"Login failed: {response.text}")
-        sys.exit(1)
-    return response.json()["access_token"]
-
 
-def get_board_symbol_id(token, board_id, label):
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{BASE_URL}/boards/{board_id}", headers=headers)
+def get_board_symbol_id(board_id, label):
+    response = SESSION.get(f"{BASE_URL}/boards/{board_id}")
     if response.status_code != 200:
         print(f"Get board failed: {response.text}")
         sys.exit(1)
@@ -43,13 +27,11 @@ def get_board_symbol_id(token, board_id, label):
     sys.exit(1)
 
 
-def update_symbol(token, board_id, symbol_id, linked_board_id):
-    headers = {"Authorization": f"Bearer {token}"}
+def update_symbol(board_id, symbol_id, linked_board_id):
     payload = {"linked_board_id": linked_board_id}
     print(f"Sending payload: {payload}")
-    response = requests.put(
+    response = SESSION.put(
         f"{BASE_URL}/boards/{board_id}/symbols/{symbol_id}",
-        headers=headers,
         json=payload,
     )
 
@@ -63,14 +45,14 @@ def update_symbol(token, board_id, symbol_id, linked_board_id):
 
 def main():
     print("Logging in...")
-    token = login()
+    login()
 
     print(f"Getting symbol ID for '{SYMBOL_LABEL}'...")
-    symbol_id = get_board_symbol_id(token, BOARD_ID, SYMBOL_LABEL)
+    symbol_id = get_board_symbol_id(BOARD_ID, SYMBOL_LABEL)
     print(f"Found symbol ID: {symbol_id}")
 
     print(f"Linking symbol to board {LINKED_BOARD_ID}...")
-    result = update_symbol(token, BOARD_ID, symbol_id, LINKED_BOARD_ID)
+    result = update_symbol(BOARD_ID, symbol_id, LINKED_BOARD_ID)
 
     print("Result:", result)
 
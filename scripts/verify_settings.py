@@ -1,44 +1,23 @@
 import os
 import sys
 
-import requests
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Configuration
-BASE_URL = os.environ.get("AAC_BASE_URL", "http://localhost:8086/api").rstrip("/")
-USERNAME = os.environ.get("AAC_VERIFY_USERNAME", "").strip()
-PASSWORD = os.environ.get("AAC_VERIFY_PASSWORD", "").strip()
+from scripts._verify_api import BASE_URL, SESSION, login  # noqa: E402
 
-if not USERNAME or not PASSWORD:
-    raise SystemExit(
-        "Set AAC_VERIFY_USERNAME and AAC_VERIFY_PASSWORD before running this script."
-    )
 
-
-def login():
-    response = requests.post(
-        f"{BASE_URL}/auth/token", data={"username": USERNAME, "password": PASSWORD}
-    )
-    if response.status_code != 200:
-        print(f"Login failed: {response.text}")
-        sys.exit(1)
-    return response.json()["access_token"]
-
-
-def get_settings(token):
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{BASE_URL}/auth/preferences", headers=headers)
+def get_settings():
+    response = SESSION.get(f"{BASE_URL}/auth/preferences")
     if response.status_code != 200:
         print(f"Get settings failed: {response.text}")
         sys.exit(1)
     return response.json()
 
 
-def update_settings(token, dwell_time):
-    headers = {"Authorization": f"Bearer {token}"}
+def update_settings(dwell_time):
     payload = {"dwell_time": dwell_time}
-    response = requests.put(
-        f"{BASE_URL}/auth/preferences", headers=headers, json=payload
-    )
+    response = SESSION.put(f"{BASE_URL}/auth/preferences", json=payload)
     if response.status_code != 200:
         print(f"Update settings failed: {response.text}")
         sys.exit(1)
@@ -47,16 +26,16 @@ def update_settings(token, dwell_time):
 
 def main():
     print("Logging in...")
-    token = login()
+    login()
 
     print("Getting current settings...")
-    settings = get_settings(token)
+    settings = get_settings()
     print(f"Current dwell_time: {settings.get('dwell_time')}")
 
     new_dwell = 500 if settings.get("dwell_time") != 500 else 1000
     print(f"Updating dwell_time to {new_dwell}...")
 
-    updated = update_settings(token, new_dwell)
+    updated = update_settings(new_dwell)
     print(f"Updated dwell_time: {updated.get('dwell_time')}")
 
     if updated.get("dwell_time") == new_dwell:
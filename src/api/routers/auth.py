@@ -532,10 +532,11 @@ def get_users(
     skip: int = 0, 
     limit: int = 100, 
     user_type: Optional[str] = None,
+    username: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """List all users (Admin/Teacher only)"""
+    """List all users (Admin/Teacher only), optionally narrowed to one exact username"""
     if current_user.user_type == 'student':
         raise HTTPException(status_code=403, detail="Not authorized to view user list")
 
@@ -561,12 +562,16 @@ def get_users(
                 .filter(StudentTeacher.teacher_id == current_user.id)
                 .filter(User.user_type == "student")
             )
+        if username is not None:
+            query = query.filter(User.username == username)
         return query.offset(skip).limit(limit).all()
 
     # Admin: all users, optionally filtered by role
     query = db.query(User)
     if user_type is not None:
         query = query.filter(User.user_type == user_type)
+    if username is not None:
+        query = query.filter(User.username == username)
     return query.offset(skip).limit(limit).all()
 
 @router.get("/users/{user_id}", response_model=schemas.UserResponse)
@@ -48,6 +48,15 @@ def test_admin_manage_teachers(setup_test_db, admin_token, test_db_session):
     assert any(s["id"] == student_id for s in students)
     assert not any(s["id"] == teacher_id for s in students)
 
+    # Exact-username filter returns just that user
+    response = client.get(
+        "/api/auth/users",
+        params={"username": "new_student", "user_type": "student"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [u["id"] for u in response.json()] == [student_id]
+
     # 4. Update Teacher
     update_data = {"display_name": "Updated Teacher Name"}
     response = client.put(f"/api/auth/users/{teacher_id}", json=update_data, headers=headers)
@@ -0,0 +1,66 @@
+"""
+Tests for the SHA-256 -> bcrypt password migration script
+"""
+
+import hashlib
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import bcrypt
+import pytest
+
+from scripts import migrate_passwords
+from src.aac_app.models.database import User
+
+TEMP_PASSWORD = "Temp-Passw0rd!"
+
+
+@pytest.fixture
+def legacy_users(test_db_session):
+    """Three users still on SHA-256 plus one already on bcrypt."""
+    for i in range(3):
+        test_db_session.add(
+            User(
+                username=f"legacy{i}",
+                display_name=f"Legacy {i}",
+                user_type="student",
+                password_hash=hashlib.sha256(f"old{i}".encode()).hexdigest(),
+            )
+        )
+    test_db_session.add(
+        User(
+            username="modern",
+            display_name="Modern",
+            user_type="student",
+            password_hash=bcrypt.hashpw(b"kept", bcrypt.gensalt(rounds=4)).decode(),
+        )
+    )
+    test_db_session.commit()
+    return test_db_session
+
+
+def test_temp_password_hashed_once_per_run(legacy_users):
+    """The shared temp password is hashed once and that hash is stored for every migrated user."""
+
+    @contextmanager
+    def override_get_session():
+        yield legacy_users
+
+    with (
+        patch.object(migrate_passwords, "get_session", side_effect=override_get_session),
+        patch.object(migrate_passwords, "BCRYPT_ROUNDS", 4),
+        patch.object(
+            migrate_passwords, "_hash_temp_password", wraps=migrate_passwords._hash_temp_password
+        ) as hash_spy,
+    ):
+        migrate_passwords.migrate_passwords(TEMP_PASSWORD, skip_confirmation=True)
+
+    hash_spy.assert_called_once_with(TEMP_PASSWORD)
+
+    legacy_users.expire_all()
+    hashes = {u.username: u.password_hash for u in legacy_users.query(User).all()}
+    migrated = {hashes[f"legacy{i}"] for i in range(3)}
+    assert len(migrated) == 1
+    (new_hash,) = migrated
+    assert bcrypt.checkpw(TEMP_PASSWORD.encode(), new_hash.encode())
+    assert bcrypt.checkpw(b"kept", hashes["modern"].encode())